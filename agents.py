@@ -6,32 +6,47 @@ from dotenv import load_dotenv
 
 try:
     from crewai import LLM as CrewLLM
-    def _make_llm(model, api_key, base_url, timeout=30):
-        return CrewLLM(provider="groq", model=model, api_key=api_key, base_url=base_url, timeout=timeout)
+    def _make_llm(model, api_key, base_url, timeout=30, callbacks=None):
+        return CrewLLM(provider="groq", model=model, api_key=api_key, base_url=base_url, timeout=timeout, callbacks=callbacks)
 except Exception:
     from crewai.agent import ChatOpenAI
-    def _make_llm(model, api_key, base_url, timeout=30):
-        return ChatOpenAI(model=model, api_key=api_key, base_url=base_url, timeout=timeout)
+    def _make_llm(model, api_key, base_url, timeout=30, callbacks=None):
+        return ChatOpenAI(model=model, api_key=api_key, base_url=base_url, timeout=timeout, callbacks=callbacks)
 
 # Import tool instances (Tool objects) exported by the modules
 from tools.search_news import search_news_tool
 from tools.search_internet import search_internet_tool
 from tools.calculator_tools import calculator_tool
+from app_logging import verbose_for
 
 
 class NewsAgents:
-    def __init__(self):
+    def __init__(self, governor=None):
         """
         Initializes the NewsAgents class by setting up the Groq LLM model.
         This model will be used by all the news agents in the crew.
+
+        If a RunGovernor is given, its tool memo and budgets apply to every agent created here.
         """
         # Load environment variables
         load_dotenv()
         groq_api_key = os.getenv("GROQ_API_KEY")
+        self.governor = governor
 
         # Configure LLM (use compatibility factory to choose the available client)
         model_name = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
-        self.llm = _make_llm(model_name, groq_api_key, "https://api.groq.com/openai/v1", timeout=30)
+        callbacks = [governor.callback_handler()] if governor else None
+        self.llm = _make_llm(model_name, groq_api_key, "https://api.groq.com/openai/v1", timeout=30, callbacks=callbacks)
+
+    def _tools(self, *tools):
+        """Return the tools for an agent, routed through the run governor when there is one."""
+        return self.governor.wrap_tools(tools) if self.governor else list(tools)
+
+    def _agent_options(self):
+        """Extra Agent arguments for governed runs."""
+        # The conversation-summary memory calls the same LLM after the final answer,
+        # which would be counted against the run budget and could discard the answer
+        return {"memory": False} if self.governor else {}
 
     def news_analyst(self):
         """
@@ -42,12 +57,10 @@ class NewsAgents:
             backstory=f"""I'm a seasoned expert in news analysis and interpretation. With years of experience in journalism and media analysis, I specialize in breaking down complex news stories and identifying key trends and implications.""",
             goal=f"""Analyze news articles, identify key trends, extract meaningful insights, and provide comprehensive analysis of current events and their broader implications.""",
             # Pass the instantiated tool methods to the agent
-            tools=[
-                search_news_tool,
-                search_internet_tool
-            ],
-            verbose=True,
+            tools=self._tools(search_news_tool, search_internet_tool),
+            verbose=verbose_for("agents"),
             llm=self.llm,
+            **self._agent_options(),
         )
 
     def source_verification_specialist(self):
@@ -63,9 +76,10 @@ class NewsAgents:
                         the reliability of news content before it's reported or analyzed."""
                        ),
             # Pass the instantiated tool method to the agent
-            tools=[search_internet_tool, search_news_tool],
-            verbose=True,
+            tools=self._tools(search_internet_tool, search_news_tool),
+            verbose=verbose_for("agents"),
             llm=self.llm,
+            **self._agent_options(),
         )
 
     def trending_topics_monitor(self):
@@ -81,9 +95,10 @@ class NewsAgents:
                                 Monitor trending topics, identify viral news stories, track story development over time,
                                 and provide insights into what content is gaining traction and why."""),
             # Pass the instantiated tool method to the agent
-            tools=[search_news_tool, search_internet_tool],
-            verbose=True,
+            tools=self._tools(search_news_tool, search_internet_tool),
+            verbose=verbose_for("agents"),
             llm=self.llm,
+            **self._agent_options(),
         )
 
     def news_researcher(self):
@@ -99,9 +114,10 @@ class NewsAgents:
                                 Conduct thorough research on specified topics, gather information from multiple reliable sources,
                                 and provide comprehensive, well-structured reports on current events and news topics."""),
             # Pass the instantiated tool method to the agent
-            tools=[search_news_tool, search_internet_tool],
-            verbose=True,
+            tools=self._tools(search_news_tool, search_internet_tool),
+            verbose=verbose_for("agents"),
             llm=self.llm,
+            **self._agent_options(),
         )
 
     def general_inquiry_agent(self):
@@ -118,7 +134,8 @@ class NewsAgents:
                                 Answer general questions and inquiries with accurate, well-researched information from multiple sources.
                                 Provide clear explanations and helpful insights on a wide range of topics."""),
             # Pass the instantiated tool method to the agent
-            tools=[search_internet_tool],
-            verbose=True,
+            tools=self._tools(search_internet_tool),
+            verbose=verbose_for("agents"),
             llm=self.llm,
+            **self._agent_options(),
         )
@@ -0,0 +1,144 @@
+"""Structured, non-blocking logging for the crew, tools and UI.
+
+Log records are put on an in-memory queue by the calling thread and written
+to stderr by a single background listener, so request threads never block on
+the console or a container log pipe. Every record carries the current run ID
+and is scrubbed of API keys before it is written.
+
+Configuration (environment variables):
+
+    NEWS_AGENT_LOG_LEVEL=INFO                  # default level for all components
+    NEWS_AGENT_LOG_LEVELS=tools=DEBUG,cache=WARNING
+    NEWS_AGENT_LOG_FORMAT=text                 # or json, one object per line
+    NEWS_AGENT_VERBOSE=0                       # crewai Agent/Crew/Tool verbose output:
+                                               # 1 for all, or e.g. agents,crew
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+from contextlib import contextmanager
+
+ROOT_LOGGER = "news_agent"
+_SECRET_ENV_VARS = ("GROQ_API_KEY", "GNEWS_API_KEY", "SERPER_API_KEY")
+_SECRET_PATTERNS = [
+    re.compile(r"(?i)(api[_-]?key=)[^&\s'\"]+"),
+    re.compile(r"(?i)(x-api-key['\"]?\s*[:=]\s*['\"]?)[^'\"\s,}]+"),
+    re.compile(r"(?i)(authorization['\"]?\s*[:=]\s*['\"]?bearer\s+)[^'\"\s,}]+"),
+]
+
+_run_id = contextvars.ContextVar("news_agent_run_id", default="-")
+_listener = None
+_configure_lock = threading.Lock()
+
+
+def redact(text):
+    """Remove API keys from a log message or error text."""
+    for pattern in _SECRET_PATTERNS:
+        text = pattern.sub(r"\1[REDACTED]", text)
+    for name in _SECRET_ENV_VARS:
+        value = os.getenv(name)
+        if value and len(value) >= 8:
+            text = text.replace(value, "[REDACTED]")
+    return text
+
+
+class _ContextFilter(logging.Filter):
+    """
+        Attaches the current run ID to each record.
+
+        Filters on the QueueHandler run in the calling thread, which is the only place
+        the run_context() value is visible. Redaction is left to the formatters.
+    """
+
+    def filter(self, record):
+        record.run_id = _run_id.get()
+        return True
+
+
+class _RedactingFormatter(logging.Formatter):
+    def format(self, record):
+        return redact(super().format(record))
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "run_id": getattr(record, "run_id", "-"),
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return redact(json.dumps(entry, ensure_ascii=False))
+
+
+def _parse_levels(spec):
+    levels = {}
+    for item in (spec or "").split(","):
+        if "=" in item:
+            component, level = item.split("=", 1)
+            levels[component.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging():
+    """Set up the queue handler and background listener once per process."""
+    global _listener
+    if _listener is not None:
+        return
+    with _configure_lock:
+        if _listener is not None:
+            return
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel(os.getenv("NEWS_AGENT_LOG_LEVEL", "INFO").upper())
+        root.propagate = False
+        for component, level in _parse_levels(os.getenv("NEWS_AGENT_LOG_LEVELS")).items():
+            logging.getLogger(f"{ROOT_LOGGER}.{component}").setLevel(level)
+
+        output = logging.StreamHandler()
+        if os.getenv("NEWS_AGENT_LOG_FORMAT", "text").lower() == "json":
+            output.setFormatter(_JsonFormatter())
+        else:
+            output.setFormatter(_RedactingFormatter("%(asctime)s %(levelname)s [%(run_id)s] %(name)s: %(message)s"))
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(_ContextFilter())
+        root.addHandler(queue_handler)
+
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
+def get_logger(component):
+    """Return the logger for a component, e.g. get_logger("tools.search_news")."""
+    configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{component}")
+
+
+@contextmanager
+def run_context(run_id):
+    """Tag every log record emitted inside the block (in this context) with run_id."""
+    token = _run_id.set(run_id)
+    try:
+        yield
+    finally:
+        _run_id.reset(token)
+
+
+def verbose_for(component):
+    """Whether crewai verbose output is enabled for a component ("agents", "crew" or "tools")."""
+    setting = os.getenv("NEWS_AGENT_VERBOSE", "0").strip().lower()
+    if setting in ("1", "true", "yes", "on", "all"):
+        return True
+    return component in {item.strip() for item in setting.split(",")}
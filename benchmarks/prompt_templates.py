@@ -0,0 +1,76 @@
+"""Compare the verbose and compact task templates.
+
+Usage:
+    python benchmarks/prompt_templates.py                      # prompt tokens per task
+    python benchmarks/prompt_templates.py --model gpt-4o       # with a specific tiktoken model
+    python benchmarks/prompt_templates.py --e2e --repeats 2    # also time real crew runs (needs API keys)
+
+The end-to-end mode runs a NewsResearchCrew and a GeneralInquiryCrew per style
+with caching disabled and reports wall-clock latency per run.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_templates import PROMPT_STYLES, token_report  # noqa: E402
+
+
+def print_token_table(models):
+    rows = token_report(models=models)
+    print(f"{'task':<26}{'model':<16}" + "".join(f"{style:>10}" for style in PROMPT_STYLES) + f"{'saved':>9}")
+    by_key = {}
+    for row in rows:
+        by_key.setdefault((row["task"], row["model"]), {})[row["style"]] = row["prompt_tokens"]
+    totals = {style: 0 for style in PROMPT_STYLES}
+    for (task, model), counts in by_key.items():
+        for style in PROMPT_STYLES:
+            totals[style] += counts[style]
+        saved = 1 - counts["compact"] / counts["verbose"]
+        print(f"{task:<26}{model:<16}" + "".join(f"{counts[s]:>10}" for s in PROMPT_STYLES) + f"{saved:>9.0%}")
+    saved = 1 - totals["compact"] / totals["verbose"]
+    print(f"{'total':<42}" + "".join(f"{totals[s]:>10}" for s in PROMPT_STYLES) + f"{saved:>9.0%}")
+
+
+def run_e2e(repeats, topic, question):
+    from cache import LocalCache, SharedCache, set_cache
+    from crew import GeneralInquiryCrew, NewsResearchCrew
+
+    # Every run must reach the LLM and the search APIs
+    set_cache(SharedCache(local=LocalCache(max_entries=0)))
+
+    for label, make_crew in (
+        ("news", lambda style: NewsResearchCrew([topic], prompt_style=style)),
+        ("general", lambda style: GeneralInquiryCrew(question, prompt_style=style)),
+    ):
+        for style in PROMPT_STYLES:
+            timings = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                make_crew(style).run()
+                timings.append(time.perf_counter() - started)
+            print(f"{label:<8}{style:<9} median {statistics.median(timings):6.1f}s  "
+                  f"min {min(timings):6.1f}s  runs {len(timings)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", action="append", help="tiktoken model name; repeat for several")
+    parser.add_argument("--e2e", action="store_true", help="also time real crew runs per style")
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--topic", default="AI chips")
+    parser.add_argument("--question", default="How do semiconductor export controls work?")
+    args = parser.parse_args()
+
+    print_token_table(args.model or [None])
+    if args.e2e:
+        print()
+        run_e2e(args.repeats, args.topic, args.question)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""Shared cache for tool results, router decisions and final reports.
+
+The backend is chosen with NEWS_AGENT_CACHE_URL:
+
+    (unset)                     in-process LRU only
+    redis://[:password@]host:6379/0
+    sqlite:///cache.db          single-host, shared between processes (WAL mode);
+    sqlite:////abs/cache.db     relative path with three slashes, absolute with four
+
+Keys are namespaced by model and NEWS_AGENT_CACHE_VERSION, so bumping the
+version (or switching GROQ_MODEL) never serves stale entries from an older
+configuration. Values are JSON-compatible and stored zlib-compressed.
+
+If the shared store is unreachable the cache keeps working from the local
+in-process layer and retries the shared store after a cooldown.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from urllib.parse import urlparse, unquote
+
+from app_logging import get_logger
+
+logger = get_logger("cache")
+
+# Default time-to-live per kind of entry, in seconds
+TTL_TOOL = 15 * 60
+TTL_ROUTER = 24 * 60 * 60
+TTL_REPORT = 30 * 60
+
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+_COMPRESS_THRESHOLD = 256
+
+
+class CacheUnavailable(Exception):
+    """Raised by a backend when the underlying store cannot be reached."""
+
+
+def encode(value):
+    """Serialize a JSON-compatible value into compact bytes."""
+    raw = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if len(raw) >= _COMPRESS_THRESHOLD:
+        return _ZLIB + zlib.compress(raw, 6)
+    return _RAW + raw
+
+
+def decode(data):
+    """Inverse of encode()."""
+    header, body = data[:1], data[1:]
+    if header == _ZLIB:
+        body = zlib.decompress(body)
+    return json.loads(body.decode("utf-8"))
+
+
+class LocalCache:
+    """Thread-safe in-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl if ttl else None)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RedisCache:
+    """Minimal client for the Redis protocol (RESP2): GET, SET with PX, DEL."""
+
+    def __init__(self, host="localhost", port=6379, db=0, password=None, timeout=0.5):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @classmethod
+    def from_url(cls, url):
+        parsed = urlparse(url)
+        db = parsed.path.lstrip("/")
+        return cls(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(db) if db else 0,
+            password=unquote(parsed.password) if parsed.password else None,
+        )
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            conn = (sock, sock.makefile("rb"))
+            self._local.conn = conn
+            if self.password:
+                self._call(b"AUTH", self.password.encode())
+            if self.db:
+                self._call(b"SELECT", str(self.db).encode())
+        return conn
+
+    def _close(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn[1].close()
+                conn[0].close()
+            except OSError:
+                pass
+
+    def _call(self, *args):
+        try:
+            sock, reader = self._connection()
+            command = [b"*%d\r\n" % len(args)]
+            for arg in args:
+                command.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+            sock.sendall(b"".join(command))
+            return self._read_reply(reader)
+        except (OSError, ValueError) as e:
+            self._close()
+            raise CacheUnavailable(f"Redis at {self.host}:{self.port} unavailable: {e}")
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ValueError("connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload
+        if kind == b"-":
+            raise ValueError(payload.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            return None if count < 0 else [self._read_reply(reader) for _ in range(count)]
+        raise ValueError(f"unexpected reply {line!r}")
+
+    def get(self, key):
+        return self._call(b"GET", key.encode())
+
+    def set(self, key, value, ttl=None):
+        if ttl:
+            self._call(b"SET", key.encode(), value, b"PX", str(int(ttl * 1000)).encode())
+        else:
+            self._call(b"SET", key.encode(), value)
+
+    def delete(self, key):
+        self._call(b"DEL", key.encode())
+
+
+class SQLiteCache:
+    """Cache table in a SQLite database in WAL mode, shared by processes on one host."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        try:
+            row = self._connection().execute(
+                "SELECT value, expires FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            raise CacheUnavailable(f"SQLite cache at {self.path} unavailable: {e}")
+        if row is None:
+            return None
+        value, expires = row
+        if expires is not None and expires < time.time():
+            self.delete(key)
+            return None
+        return bytes(value)
+
+    def set(self, key, value, ttl=None):
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl if ttl else None),
+            )
+        except sqlite3.Error as e:
+            raise CacheUnavailable(f"SQLite cache at {self.path} unavailable: {e}")
+
+    def delete(self, key):
+        try:
+            self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            raise CacheUnavailable(f"SQLite cache at {self.path} unavailable: {e}")
+
+
+class SharedCache:
+    """
+        Two-level cache: an in-process LRU in front of an optional shared backend.
+
+        Reads check the local layer first, then the shared backend. Writes go to both.
+        When the shared backend raises CacheUnavailable it is skipped for
+        ``retry_after`` seconds and the local layer keeps serving.
+    """
+
+    def __init__(self, backend=None, model=None, version=None, local=None, retry_after=30.0, local_ttl=60.0):
+        self.backend = backend
+        self.local = local or LocalCache()
+        self.prefix = "nsa:{}:{}".format(
+            version or os.getenv("NEWS_AGENT_CACHE_VERSION", "1"),
+            model or os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile"),
+        )
+        self.retry_after = retry_after
+        # Entries copied from the shared store are kept locally only briefly
+        self.local_ttl = local_ttl
+        self._down_until = 0.0
+
+    def make_key(self, namespace, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return f"{self.prefix}:{namespace}:{digest}"
+
+    def _shared_available(self):
+        return self.backend is not None and time.time() >= self._down_until
+
+    def _mark_down(self, error):
+        self._down_until = time.time() + self.retry_after
+        logger.warning("Shared cache unavailable, using local cache for %.0fs: %s", self.retry_after, error)
+
+    def get(self, namespace, key):
+        full_key = self.make_key(namespace, key)
+        value = self.local.get(full_key)
+        if value is not None or not self._shared_available():
+            return value
+        try:
+            data = self.backend.get(full_key)
+        except CacheUnavailable as e:
+            self._mark_down(e)
+            return None
+        if data is None:
+            return None
+        try:
+            value = decode(data)
+        except (ValueError, zlib.error):
+            return None
+        self.local.set(full_key, value, self.local_ttl)
+        return value
+
+    def set(self, namespace, key, value, ttl=None):
+        full_key = self.make_key(namespace, key)
+        self.local.set(full_key, value, ttl)
+        if self._shared_available():
+            try:
+                self.backend.set(full_key, encode(value), ttl)
+            except CacheUnavailable as e:
+                self._mark_down(e)
+
+    def delete(self, namespace, key):
+        full_key = self.make_key(namespace, key)
+        self.local.delete(full_key)
+        if self._shared_available():
+            try:
+                self.backend.delete(full_key)
+            except CacheUnavailable as e:
+                self._mark_down(e)
+
+
+def backend_from_url(url):
+    """Create a shared backend from a cache URL, or None for local-only caching."""
+    if not url:
+        return None
+    scheme = urlparse(url).scheme
+    if scheme == "redis":
+        return RedisCache.from_url(url)
+    if scheme == "sqlite":
+        return SQLiteCache(url[len("sqlite:///"):] if url.startswith("sqlite:///") else urlparse(url).path)
+    raise ValueError(f"Unsupported cache URL scheme '{scheme}'. Use redis:// or sqlite:///")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide cache configured from NEWS_AGENT_CACHE_URL."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SharedCache(backend_from_url(os.getenv("NEWS_AGENT_CACHE_URL")))
+    return _cache
+
+
+def set_cache(cache):
+    """Replace the process-wide cache, e.g. with a local-only or disabled one for benchmarks."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
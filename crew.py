@@ -2,10 +2,36 @@ from crewai import Crew
 from agents import NewsAgents       # Updated to use NewsAgents class
 from tasks import NewsTasks         # Updated to use NewsTasks class
 from agents import _make_llm
+from profiling import profile_run
+from cache import TTL_REPORT, TTL_ROUTER, get_cache
+from governor import BudgetExceeded, RunGovernor
+from task_templates import prompt_style as resolve_prompt_style
+from app_logging import get_logger, run_context, verbose_for
+from langchain_core.messages import HumanMessage
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
 import os
+import uuid
 from dotenv import load_dotenv
 
 load_dotenv()
+logger = get_logger("crew")
+
+# crewai's kickoff() is blocking, so async callers run it on this bounded pool.
+# Its size caps how many crews execute at once; further arun() calls wait their turn.
+_crew_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("NEWS_AGENT_CREW_WORKERS", "4")),
+    thread_name_prefix="crew",
+)
+
+
+async def _run_blocking(func, *args):
+    loop = asyncio.get_running_loop()
+    # Carry context variables (such as the logging run ID) into the worker thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_crew_executor, context.run, func, *args)
+
 
 class QueryRouter:
     """Routes queries to either news or general inquiry based on content analysis."""
@@ -15,12 +41,8 @@ class QueryRouter:
         model_name = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
         self.llm = _make_llm(model_name, groq_api_key, "https://api.groq.com/openai/v1", timeout=30)
     
-    def route_query(self, query):
-        """
-        Determines if a query is news-related or general inquiry.   
-        Returns 'news' or 'general'.
-        """
-        prompt = f"""You are a query classifier. Determine if the following query is asking for NEWS/current events information or if it's a GENERAL inquiry about a topic.
+    def _prompt(self, query):
+        return f"""You are a query classifier. Determine if the following query is asking for NEWS/current events information or if it's a GENERAL inquiry about a topic.
 
 News-related queries ask about:
 - Current events, breaking news, recent developments
@@ -39,33 +61,69 @@ Query: "{query}"
 
 Respond with ONLY one word: "news" or "general"."""
 
+    def _decide(self, cache_key, response):
+        # Extract text from the response object
+        result_text = response.content if hasattr(response, 'content') else str(response)
+        result = result_text.lower().strip()
+
+        # Ensure we return either 'news' or 'general'
+        if 'news' in result:
+            decision = 'news'
+        elif 'general' in result:
+            decision = 'general'
+        else:
+            # Default to general if uncertain
+            decision = 'general'
+        get_cache().set("router", cache_key, decision, TTL_ROUTER)
+        return decision
+
+    def route_query(self, query):
+        """
+        Determines if a query is news-related or general inquiry.   
+        Returns 'news' or 'general'.
+        """
+        cache_key = query.strip().lower()
+        cached = get_cache().get("router", cache_key)
+        if cached in ('news', 'general'):
+            return cached
+
         try:
             # Use invoke which is the current standard interface for LangChain
-            from langchain_core.messages import HumanMessage
-            response = self.llm.invoke([HumanMessage(content=prompt)])
-            
-            # Extract text from the response object
-            result_text = response.content if hasattr(response, 'content') else str(response)
-            result = result_text.lower().strip()
-            
-            # Ensure we return either 'news' or 'general'
-            if 'news' in result:
-                return 'news'
-            elif 'general' in result:
-                return 'general'
-            else:
-                # Default to general if uncertain
-                return 'general'
+            response = self.llm.invoke([HumanMessage(content=self._prompt(query))])
+            return self._decide(cache_key, response)
         except Exception as e:
-            print(f"Error in query routing: {e}")
+            logger.warning("Error in query routing: %s", e)
             # Default to general on error
             return 'general'
 
+    async def aroute_query(self, query):
+        """Asyncio version of route_query, using the LLM's ainvoke."""
+        cache_key = query.strip().lower()
+        cached = await asyncio.to_thread(get_cache().get, "router", cache_key)
+        if cached in ('news', 'general'):
+            return cached
+
+        try:
+            response = await self.llm.ainvoke([HumanMessage(content=self._prompt(query))])
+            return await asyncio.to_thread(self._decide, cache_key, response)
+        except Exception as e:
+            logger.warning("Error in query routing: %s", e)
+            return 'general'
+
 class NewsResearchCrew:
-    def __init__(self, topics):
+    def __init__(self, topics, run_id=None, prompt_style=None):
         self.topics = topics
+        self.prompt_style = prompt_style
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        # Set when the run governor stopped the crew before it finished
+        self.stopped_early = False
+
+    def _report_key(self):
+        topics = "|".join(sorted(topic.strip().lower() for topic in self.topics))
+        # Reports written with different prompt styles are cached separately
+        return f"{resolve_prompt_style(self.prompt_style)}:{topics}"
     
-    def run(self):
+    def run(self, profile=None):
         """
             Executes the news research process by:
 
@@ -76,11 +134,36 @@ class NewsResearchCrew:
 
             Returns:
                 str: A comprehensive news research report covering the specified topics.
+
+            Set ``profile=True`` (or NEWS_AGENT_PROFILE) to record a sampling profile of this run.
+            Reports are cached in the shared cache (see cache.py), so repeat requests skip the crew.
+        """
+        cache_key = self._report_key()
+        cached = get_cache().get("report:news", cache_key)
+        if cached is not None:
+            return cached
+
+        with run_context(self.run_id), profile_run(self.run_id, profile):
+            result = self._run()
+        if result and not self.stopped_early:
+            get_cache().set("report:news", cache_key, str(result), TTL_REPORT)
+        return result
+
+    async def arun(self, profile=None):
         """
-        
+            Asyncio version of run(). The cache lookup runs in a worker thread and the
+            blocking crew on a bounded thread pool, so neither blocks the event loop.
+        """
+        cached = await asyncio.to_thread(get_cache().get, "report:news", self._report_key())
+        if cached is not None:
+            return cached
+        return await _run_blocking(self.run, profile)
+
+    def _run(self):
         # Initialize news agents and tasks
-        news_agents = NewsAgents()    # Updated to use NewsAgents class
-        news_tasks = NewsTasks()      # Updated to use NewsTasks class
+        governor = RunGovernor()
+        news_agents = NewsAgents(governor)
+        news_tasks = NewsTasks(self.prompt_style)
 
         # Create agent instance
         news_researcher = news_agents.news_researcher()
@@ -95,18 +178,31 @@ class NewsResearchCrew:
         news_crew = Crew(
             agents=[news_researcher],
             tasks=[news_research_task],
-            verbose=True,
+            verbose=verbose_for("crew"),
         )
 
-        result = news_crew.kickoff()
+        try:
+            result = news_crew.kickoff()
+        except BudgetExceeded as e:
+            # End gracefully with whatever the tools returned before the budget ran out
+            result = governor.best_available_answer(str(e))
+            self.stopped_early = True
+        logger.info("Run usage: %s", governor.usage())
         return result
 
 
 class GeneralInquiryCrew:
-    def __init__(self, query):
+    def __init__(self, query, run_id=None, prompt_style=None):
         self.query = query
+        self.prompt_style = prompt_style
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        # Set when the run governor stopped the crew before it finished
+        self.stopped_early = False
+
+    def _report_key(self):
+        return f"{resolve_prompt_style(self.prompt_style)}:{self.query.strip().lower()}"
     
-    def run(self):
+    def run(self, profile=None):
         """
             Executes the general inquiry process by:
 
@@ -117,11 +213,36 @@ class GeneralInquiryCrew:
 
             Returns:
                 str: A comprehensive answer to the user's inquiry.
+
+            Set ``profile=True`` (or NEWS_AGENT_PROFILE) to record a sampling profile of this run.
+            Reports are cached in the shared cache (see cache.py), so repeat requests skip the crew.
+        """
+        cache_key = self._report_key()
+        cached = get_cache().get("report:general", cache_key)
+        if cached is not None:
+            return cached
+
+        with run_context(self.run_id), profile_run(self.run_id, profile):
+            result = self._run()
+        if result and not self.stopped_early:
+            get_cache().set("report:general", cache_key, str(result), TTL_REPORT)
+        return result
+
+    async def arun(self, profile=None):
+        """
+            Asyncio version of run(). The cache lookup runs in a worker thread and the
+            blocking crew on a bounded thread pool, so neither blocks the event loop.
         """
-        
+        cached = await asyncio.to_thread(get_cache().get, "report:general", self._report_key())
+        if cached is not None:
+            return cached
+        return await _run_blocking(self.run, profile)
+
+    def _run(self):
         # Initialize agents and tasks
-        agents = NewsAgents()
-        tasks = NewsTasks()
+        governor = RunGovernor()
+        agents = NewsAgents(governor)
+        tasks = NewsTasks(self.prompt_style)
 
         # Create agent instance
         inquiry_agent = agents.general_inquiry_agent()
@@ -133,8 +254,14 @@ class GeneralInquiryCrew:
         inquiry_crew = Crew(
             agents=[inquiry_agent],
             tasks=[inquiry_task],
-            verbose=True,
+            verbose=verbose_for("crew"),
         )
 
-        result = inquiry_crew.kickoff()
+        try:
+            result = inquiry_crew.kickoff()
+        except BudgetExceeded as e:
+            # End gracefully with whatever the tools returned before the budget ran out
+            result = governor.best_available_answer(str(e))
+            self.stopped_early = True
+        logger.info("Run usage: %s", governor.usage())
         return result
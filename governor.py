@@ -0,0 +1,200 @@
+"""Per-run limits for agents: tool-call memo, call budgets and graceful wrap-up.
+
+A RunGovernor is created for each crew run and passed to NewsAgents. It:
+
+- wraps every tool so repeated or trivially reworded queries ("AI news" vs.
+  "AI news latest") return the earlier result, marked as a repeat, instead of
+  calling the API again
+- counts tool calls, LLM calls and tokens against configurable budgets
+- tells the agent to give its final answer once a budget is nearly used up,
+  and stops the run (BudgetExceeded) if the LLM budget is exceeded anyway
+
+Budgets default to the environment variables NEWS_AGENT_MAX_TOOL_CALLS,
+NEWS_AGENT_MAX_LLM_CALLS and NEWS_AGENT_MAX_TOKENS.
+"""
+
+import os
+import threading
+from crewai.tools.agent_tools import Tool
+from langchain_core.callbacks import BaseCallbackHandler
+from tools.ranking import tokenize
+from app_logging import get_logger, verbose_for
+
+logger = get_logger("governor")
+
+# Words that do not change what a search returns, so they are ignored when matching repeats
+_FILLER_WORDS = frozenset(
+    "latest recent recently news today current currently update updates breaking about whats happening".split()
+)
+# Only search queries are normalized; other tools (e.g. the calculator) are matched on their exact input
+_SEARCH_TOOLS = frozenset(["search_news", "search_internet"])
+
+REPEAT_NOTICE = (
+    "[Repeated query: this is the result already returned for an equivalent search earlier in this run. "
+    "Search for something different or give your final answer.]"
+)
+WRAP_UP_NOTICE = (
+    "[Budget for this run is used up ({reason}). Do not call any more tools. "
+    "Give your Final Answer now using the information gathered so far.]"
+)
+
+
+class BudgetExceeded(Exception):
+    """Raised to stop a run when its LLM call or token budget is exceeded."""
+
+
+def normalize_query(query):
+    """Reduce a query to a canonical form so trivially reworded searches compare equal."""
+    tokens = []
+    for token in tokenize(query):
+        # tokenize() splits "what's" and "Nvidia's" at the apostrophe
+        if token == "s" and tokens:
+            if tokens[-1] == "what":
+                tokens[-1] = "whats"
+            continue
+        tokens.append(token)
+    meaningful = [t for t in tokens if t not in _FILLER_WORDS] or tokens
+    return " ".join(meaningful)
+
+
+class _GovernorCallbackHandler(BaseCallbackHandler):
+    """Counts LLM calls and tokens for a governor and enforces its budgets."""
+
+    # Let BudgetExceeded propagate instead of being logged and swallowed by langchain
+    raise_error = True
+
+    def __init__(self, governor):
+        self.governor = governor
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self.governor.record_llm_start()
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.governor.record_llm_start()
+
+    def on_llm_end(self, response, **kwargs):
+        usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+        self.governor.record_tokens(usage.get("total_tokens", 0))
+
+
+class RunGovernor:
+    def __init__(self, max_tool_calls=None, max_llm_calls=None, max_tokens=None):
+        """
+            Parameters:
+            - max_tool_calls (int): Tool calls allowed per run (memo hits are free).
+            - max_llm_calls (int): LLM calls allowed per run.
+            - max_tokens (int): Total tokens allowed per run, as reported by the LLM provider.
+        """
+        self.max_tool_calls = max_tool_calls or int(os.getenv("NEWS_AGENT_MAX_TOOL_CALLS", "8"))
+        self.max_llm_calls = max_llm_calls or int(os.getenv("NEWS_AGENT_MAX_LLM_CALLS", "12"))
+        self.max_tokens = max_tokens or int(os.getenv("NEWS_AGENT_MAX_TOKENS", "60000"))
+        self.tool_calls = 0
+        self.llm_calls = 0
+        self.tokens = 0
+        self.repeats = 0
+        self._memo = {}
+        self._observations = []
+        self._token_grace_used = False
+        self._lock = threading.Lock()
+
+    def callback_handler(self):
+        """Return a langchain callback handler that reports LLM usage to this governor."""
+        return _GovernorCallbackHandler(self)
+
+    def wrap_tool(self, tool):
+        """Return a copy of a Tool whose calls go through this governor."""
+        async def acall(query):
+            return await self.acall_tool(tool, query)
+
+        return Tool(
+            name=tool.name,
+            func=lambda query: self.call_tool(tool, query),
+            coroutine=acall if getattr(tool, "coroutine", None) else None,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            verbose=verbose_for("tools"),
+        )
+
+    def wrap_tools(self, tools):
+        return [self.wrap_tool(tool) for tool in tools]
+
+    def exhausted_reason(self):
+        """Return why the run should wrap up, or None while budget remains."""
+        if self.tool_calls >= self.max_tool_calls:
+            return f"{self.tool_calls} tool calls"
+        # Keep the last LLM call for writing the final answer
+        if self.llm_calls >= self.max_llm_calls - 1:
+            return f"{self.llm_calls} LLM calls"
+        if self.tokens >= self.max_tokens:
+            return f"{self.tokens} tokens"
+        return None
+
+    def _before_call(self, tool, query):
+        """Return (memo key, answer) where answer is set if the tool must not be called."""
+        key = (tool.name, normalize_query(query) if tool.name in _SEARCH_TOOLS else query.strip())
+        with self._lock:
+            if key in self._memo:
+                self.repeats += 1
+                logger.info("Repeated %s query %r, returning previous result", tool.name, query)
+                return key, f"{REPEAT_NOTICE}\n{self._memo[key]}"
+            reason = self.exhausted_reason()
+            if reason:
+                logger.warning("Refusing %s call, budget used up (%s)", tool.name, reason)
+                return key, WRAP_UP_NOTICE.format(reason=reason)
+            self.tool_calls += 1
+        return key, None
+
+    def _after_call(self, key, tool, query, result):
+        # Failed calls are not remembered, so a retry can still succeed
+        if isinstance(result, str) and result.startswith("Error"):
+            return result
+        with self._lock:
+            self._memo[key] = result
+            self._observations.append((tool.name, query, result))
+        return result
+
+    def call_tool(self, tool, query):
+        key, answer = self._before_call(tool, query)
+        if answer is not None:
+            return answer
+        return self._after_call(key, tool, query, tool.func(query))
+
+    async def acall_tool(self, tool, query):
+        key, answer = self._before_call(tool, query)
+        if answer is not None:
+            return answer
+        return self._after_call(key, tool, query, await tool.coroutine(query))
+
+    def record_llm_start(self):
+        with self._lock:
+            self.llm_calls += 1
+            if self.llm_calls > self.max_llm_calls:
+                raise BudgetExceeded(f"LLM call budget of {self.max_llm_calls} exceeded")
+            if self.tokens >= self.max_tokens:
+                # Allow one more call after the wrap-up notice so the agent can write its final answer
+                if self._token_grace_used:
+                    raise BudgetExceeded(f"token budget of {self.max_tokens} exceeded")
+                self._token_grace_used = True
+
+    def record_tokens(self, count):
+        with self._lock:
+            self.tokens += count or 0
+
+    def usage(self):
+        return {
+            "tool_calls": self.tool_calls,
+            "llm_calls": self.llm_calls,
+            "tokens": self.tokens,
+            "repeats": self.repeats,
+        }
+
+    def best_available_answer(self, reason, max_chars_per_result=1500):
+        """Build a fallback answer from the tool results gathered before the run was stopped."""
+        if not self._observations:
+            return f"Research stopped early ({reason}) before any results were gathered. Please try again."
+        sections = [
+            f"Research stopped early ({reason}). These are the findings gathered so far:"
+        ]
+        for tool_name, query, result in self._observations:
+            sections.append(f"### {tool_name}: {query}\n{result[:max_chars_per_result]}")
+        return "\n\n".join(sections)
@@ -0,0 +1,173 @@
+"""Opt-in sampling profiler for individual crew runs.
+
+Enable it for every run, or for a fraction of runs, with environment variables:
+
+    NEWS_AGENT_PROFILE=1            # profile every run
+    NEWS_AGENT_PROFILE=0.05         # profile roughly 5% of runs
+    NEWS_AGENT_PROFILE_DIR=profiles # where output files are written
+    NEWS_AGENT_PROFILE_INTERVAL_MS=10
+
+or per run with ``crew.run(profile=True)``. Each profiled run writes
+``<run_id>.collapsed.txt`` (for flamegraph.pl / speedscope) and
+``<run_id>.speedscope.json`` to the output directory.
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from app_logging import get_logger
+
+logger = get_logger("profiling")
+
+# Never sample faster than this, whatever the environment asks for
+MIN_INTERVAL_MS = 5.0
+DEFAULT_INTERVAL_MS = 10.0
+MAX_STACK_DEPTH = 128
+
+# Only one profiler samples the process at a time; overlapping runs are skipped
+_active_lock = threading.Lock()
+
+
+class SamplingProfiler:
+    """Periodically samples the stacks of all threads from a background thread."""
+
+    def __init__(self, interval_ms=DEFAULT_INTERVAL_MS):
+        self.interval = max(float(interval_ms), MIN_INTERVAL_MS) / 1000.0
+        self.samples = Counter()
+        self.sample_count = 0
+        self.started_at = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="news-agent-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                self.samples[";".join(reversed(stack))] += 1
+            self.sample_count += 1
+
+    def collapsed(self):
+        """Return the profile in Brendan Gregg's collapsed-stack format."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+    def speedscope(self, name):
+        """Return the profile as a speedscope 'sampled' document, one profile per thread."""
+        frames = []
+        frame_index = {}
+        per_thread = {}
+        for stack, count in self.samples.items():
+            thread_name, *calls = stack.split(";")
+            indices = []
+            for call in calls:
+                if call not in frame_index:
+                    frame_index[call] = len(frames)
+                    frames.append({"name": call})
+                indices.append(frame_index[call])
+            samples, weights = per_thread.setdefault(thread_name, ([], []))
+            samples.append(indices)
+            weights.append(count * self.interval)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "news-search-agent",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread_name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.duration,
+                    "samples": samples,
+                    "weights": weights,
+                }
+                for thread_name, (samples, weights) in per_thread.items()
+            ],
+        }
+
+
+def should_profile(enabled=None):
+    """Decide whether to profile this run from an explicit flag or NEWS_AGENT_PROFILE."""
+    if enabled is not None:
+        return bool(enabled)
+    setting = os.getenv("NEWS_AGENT_PROFILE", "").strip().lower()
+    if setting in ("", "0", "false", "no", "off"):
+        return False
+    if setting in ("1", "true", "yes", "on"):
+        return True
+    try:
+        return random.random() < float(setting)
+    except ValueError:
+        return False
+
+
+@contextmanager
+def profile_run(run_id, enabled=None):
+    """
+        Profile the enclosed block if enabled, writing output files named after run_id.
+
+        Parameters:
+        - run_id (str): Identifier of the run, used for the output file names.
+        - enabled (bool | None): Force profiling on/off; None defers to NEWS_AGENT_PROFILE.
+    """
+    if not should_profile(enabled):
+        yield None
+        return
+    if not _active_lock.acquire(blocking=False):
+        if enabled:
+            logger.warning("Profiling requested for run %s but another run is being profiled; skipping", run_id)
+        yield None
+        return
+
+    profiler = SamplingProfiler(float(os.getenv("NEWS_AGENT_PROFILE_INTERVAL_MS", DEFAULT_INTERVAL_MS)))
+    try:
+        profiler.start()
+        try:
+            yield profiler
+        finally:
+            profiler.stop()
+            _write_profile(profiler, run_id)
+    finally:
+        _active_lock.release()
+
+
+def _write_profile(profiler, run_id):
+    out_dir = os.getenv("NEWS_AGENT_PROFILE_DIR", "profiles")
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+        collapsed_path = os.path.join(out_dir, f"{run_id}.collapsed.txt")
+        with open(collapsed_path, "w") as f:
+            f.write(profiler.collapsed())
+        with open(os.path.join(out_dir, f"{run_id}.speedscope.json"), "w") as f:
+            json.dump(profiler.speedscope(run_id), f)
+        logger.info("Profile for run %s: %d samples written to %s", run_id, profiler.sample_count, collapsed_path)
+    except OSError as e:
+        logger.warning("Could not write profile for run %s: %s", run_id, e)
@@ -12,8 +12,10 @@ import streamlit as st
 from dotenv import load_dotenv
 from crew import NewsResearchCrew, GeneralInquiryCrew, QueryRouter
 from requests.exceptions import Timeout
+from app_logging import get_logger
 
 load_dotenv()
+logger = get_logger("streamlit")
 
 st.set_page_config(page_title="Research & Inquiry Crew", layout="wide")
 st.title("🔍 Research & Inquiry Crew")
@@ -104,7 +106,7 @@ if st.session_state.get("run_query", False):
                 except Exception as e:
                     result = None
                     err = e
-                    print(f"Exception occurred: {type(e).__name__}: {str(e)}")
+                    logger.exception("Crew run failed")
                     break  # Don't retry non-timeout errors
 
         if result:
@@ -0,0 +1,298 @@
+"""Precompiled prompt templates for NewsTasks, with token accounting.
+
+Each task has a ``verbose`` template (the original wording) and a ``compact``
+one that keeps the same instructions in far fewer tokens. Templates are
+whitespace-normalized once at import, so no source indentation leaks into
+prompts. Pick the style with NEWS_AGENT_PROMPT_STYLE (verbose or compact).
+
+crewai 0.1.24's Task has no ``expected_output`` field and drops it, so only the
+description reaches the prompt: output formats the agent must follow belong in
+the description, and only the description is counted.
+
+Token counts use tiktoken when it is installed and fall back to an estimate of
+four characters per token otherwise.
+"""
+
+import math
+import os
+import re
+
+PROMPT_STYLES = ("verbose", "compact")
+DEFAULT_STYLE = "verbose"
+
+_RAW_TEMPLATES = {
+    "analyze_articles": {
+        "verbose": {
+            "description": """
+                **Task**: Analyze News Articles on Specific Topic
+                **Description**: Conduct a thorough analysis of recent news articles on {topic}.
+                Extract key information, identify different perspectives, analyze sentiment, and provide
+                a comprehensive summary with insights. Focus on credible sources and verify information
+                across multiple outlets to ensure accuracy and completeness.
+                **Parameters**:
+                - Topic: {topic}
+                - Article Count: {article_count}
+                - Focus Areas: {focus_areas}
+            """,
+            "expected_output": """
+                A structured analysis including:
+                - Key findings and insights
+                - Perspectives and sentiment overview
+                - Notable quotes and statistics
+                - Summary with actionable takeaways
+            """,
+        },
+        "compact": {
+            "description": """
+                Analyze {article_count} recent credible news articles on {topic}, cross-checking outlets.
+                Focus: {focus_areas}.
+            """,
+            "expected_output": "Key findings; perspectives and sentiment; notable quotes and statistics; actionable takeaways.",
+        },
+    },
+    "evaluate_sources": {
+        "verbose": {
+            "description": """
+                **Task**: Evaluate News Source Credibility and Reliability
+                **Objective**: Analyze multiple news sources and assess their reliability
+                for covering {topic}. Provide rankings based on credibility and quality metrics.
+
+                **Key Considerations**:
+                - Assess source credibility, fact-checking standards, and editorial policies.
+                - Analyze potential bias, political leanings, and reporting objectivity.
+                - Evaluate coverage quality, depth, and journalistic standards.
+                - Consider source track record and reputation in the industry.
+
+                **Evaluation Details**:
+                - Topic Focus: {topic}
+                - Source Types: {source_types}
+                - Credibility Criteria: {credibility_criteria}
+            """,
+            "expected_output": """
+                A ranked list of sources with:
+                - Credibility scores and justifications
+                - Bias analysis and leanings
+                - Reporting quality notes
+                - Coverage breadth/depth assessment
+            """,
+        },
+        "compact": {
+            "description": """
+                Rank news sources covering {topic} by credibility: fact-checking, bias, coverage depth, track record.
+                Source types: {source_types}. Criteria: {credibility_criteria}.
+            """,
+            "expected_output": "Ranked sources with credibility score and reason, bias, reporting quality, coverage depth.",
+        },
+    },
+    "monitor_trending_topics": {
+        "verbose": {
+            "description": """
+                **Task**: Monitor and Analyze Trending News Topics
+                **Objective**: Track trending topics across {categories} to identify emerging stories,
+                viral content, and developing news events. Provide insights into story momentum and public interest.
+                **Key Insights to Include**:
+                - Top trending topics and their growth patterns.
+                - Social media engagement metrics and viral potential.
+                - Geographic distribution of interest and regional variations.
+                - Timeline analysis showing how topics develop and spread.
+                **Monitoring Parameters**:
+                - Categories: {categories}
+                - Time Period: {time_period}
+                - Regions: {regions}
+            """,
+            "expected_output": """
+                A trends report including:
+                - Top trending topics with momentum
+                - Engagement metrics
+                - Regional interest patterns
+                - Timeline of development
+            """,
+        },
+        "compact": {
+            "description": """
+                Find trending and emerging stories in {categories} over {time_period} for {regions}:
+                growth, engagement, regional interest, how they spread.
+            """,
+            "expected_output": "Top trends with momentum, engagement, regional patterns, timeline.",
+        },
+    },
+    "research_news": {
+        "verbose": {
+            "description": """
+                **Task**: Comprehensive News Research and Analysis
+                **Objective**: Research and analyze current news on the specified topics, providing
+                a detailed report with insights, trends, and key developments.
+
+                **Research Requirements**:
+                - Search for the latest news articles on each topic
+                - Identify key trends, patterns, and developments
+                - Analyze the significance and implications of major events
+                - Summarize findings in a clear, structured format
+                - Include relevant dates, sources, and context
+
+                **Output Format**:
+                - Executive summary of key findings
+                - Detailed analysis for each topic
+                - Timeline of important events
+                - Trend analysis and implications
+                - Source citations and reliability assessment
+
+                **Research Parameters**:
+                - Topics: {topics}
+                - Focus: Current events and recent developments
+            """,
+            "expected_output": """
+                A comprehensive report covering:
+                - Executive summary
+                - Topic-by-topic analysis
+                - Event timeline
+                - Trend implications
+                - Source citations
+            """,
+        },
+        "compact": {
+            "description": """
+                Research the latest news on: {topics}.
+                Identify key developments, trends and their implications, with dates and sources.
+                Output: executive summary; per-topic analysis; event timeline; trend implications;
+                source citations with reliability.
+            """,
+            "expected_output": "Executive summary; per-topic analysis; event timeline; trend implications; cited sources.",
+        },
+    },
+    "general_inquiry": {
+        "verbose": {
+            "description": """
+                **Task**: Answer General Inquiry Question
+                **Objective**: Research and provide a comprehensive answer to the following question:
+
+                {query}
+
+                **Requirements**:
+                - Search for accurate, relevant information
+                - Synthesize information from multiple reliable sources
+                - Provide clear, well-structured explanation
+                - Include context, examples, and relevant details
+                - Cite sources and maintain objectivity
+
+                **Output Format**:
+                - Direct answer to the question
+                - Supporting details and explanation
+                - Relevant context and examples
+                - Source citations
+            """,
+            "expected_output": """
+                A comprehensive answer including:
+                - Clear response to the inquiry
+                - Supporting details and explanation
+                - Relevant context and examples
+                - Source citations
+            """,
+        },
+        "compact": {
+            "description": """
+                Answer this question accurately using multiple reliable sources:
+                {query}
+                Output: direct answer; supporting explanation with context and examples; source citations.
+            """,
+            "expected_output": "Direct answer; supporting explanation with context and examples; cited sources.",
+        },
+    },
+}
+
+# Example parameters used for token reports and benchmarks
+SAMPLE_PARAMS = {
+    "analyze_articles": {"topic": "AI regulation", "article_count": 5, "focus_areas": ["policy", "industry impact"]},
+    "evaluate_sources": {
+        "topic": "AI regulation",
+        "source_types": ["newspapers", "online outlets"],
+        "credibility_criteria": ["fact-checking", "bias"],
+    },
+    "monitor_trending_topics": {
+        "categories": ["technology", "finance"],
+        "time_period": "last 7 days",
+        "regions": ["US", "EU"],
+    },
+    "research_news": {"topics": ["AI chips"]},
+    "general_inquiry": {"query": "How do semiconductor export controls work?"},
+}
+
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def normalize(text):
+    """Strip per-line indentation and trailing spaces, and collapse runs of blank lines."""
+    lines = [line.strip() for line in text.strip().splitlines()]
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines))
+
+
+# Normalize every template once, at import
+TEMPLATES = {
+    task: {
+        style: {part: normalize(text) for part, text in parts.items()}
+        for style, parts in styles.items()
+    }
+    for task, styles in _RAW_TEMPLATES.items()
+}
+
+
+def prompt_style(style=None):
+    """Resolve the prompt style from the argument or NEWS_AGENT_PROMPT_STYLE."""
+    style = (style or os.getenv("NEWS_AGENT_PROMPT_STYLE", DEFAULT_STYLE)).strip().lower()
+    if style not in PROMPT_STYLES:
+        raise ValueError(f"Unknown prompt style '{style}', expected one of {PROMPT_STYLES}")
+    return style
+
+
+def render(task, style=None, **params):
+    """
+        Fill in a task template.
+
+        Returns:
+        - tuple: (description, expected_output) strings.
+    """
+    template = TEMPLATES[task][prompt_style(style)]
+    return template["description"].format(**params), template["expected_output"].format(**params)
+
+
+_encodings = {}
+
+
+def count_tokens(text, model=None):
+    """Count tokens with the model's tiktoken encoding, or estimate when tiktoken is unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return math.ceil(len(text) / 4)
+    key = model or "cl100k_base"
+    if key not in _encodings:
+        try:
+            _encodings[key] = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(key)
+        except (KeyError, ValueError):
+            # Models tiktoken does not know (e.g. Llama on Groq) are approximated with cl100k_base
+            _encodings[key] = tiktoken.get_encoding("cl100k_base")
+    return len(_encodings[key].encode(text))
+
+
+def token_report(models=(None,), styles=PROMPT_STYLES, params=None):
+    """
+        Count prompt tokens for every task, style and model.
+
+        Only the description is counted, since that is all crewai sends to the LLM.
+
+        Returns:
+        - list: Dicts with task, style, model and prompt_tokens.
+    """
+    params = params or SAMPLE_PARAMS
+    rows = []
+    for task in TEMPLATES:
+        for style in styles:
+            description, _ = render(task, style, **params[task])
+            for model in models:
+                rows.append({
+                    "task": task,
+                    "style": style,
+                    "model": model or "default",
+                    "prompt_tokens": count_tokens(description, model),
+                })
+    return rows
@@ -1,7 +1,27 @@
+import logging
 from crewai import Task
-from textwrap import dedent
+from app_logging import get_logger
+from task_templates import count_tokens, prompt_style as resolve_prompt_style, render
+
+logger = get_logger("tasks")
 
 class NewsTasks:
+    def __init__(self, prompt_style=None):
+        """
+            Parameters:
+            - prompt_style (str): "verbose" or "compact"; defaults to NEWS_AGENT_PROMPT_STYLE.
+        """
+        self.prompt_style = prompt_style
+
+    def _task(self, name, agent, **params):
+        """Render a task template, report its prompt size and wrap it in a Task."""
+        style = resolve_prompt_style(self.prompt_style)
+        description, expected_output = render(name, style, **params)
+        if logger.isEnabledFor(logging.INFO):
+            # expected_output is passed along but crewai 0.1.24 does not send it to the LLM
+            logger.info("Task %s (%s): %d prompt tokens", name, style, count_tokens(description))
+        return Task(description=description, agent=agent, expected_output=expected_output)
+
     def analyze_articles(self, agent, topic, article_count, focus_areas):
         """
             Creates a task for the agent to analyze news articles on a specific topic.
@@ -20,23 +40,7 @@ class NewsTasks:
             Returns:
                 Task: The fully defined task for news article analysis.
         """
-        return Task(
-                    description = dedent(f"""**Task**: Analyze News Articles on Specific Topic
-                                    **Description**: Conduct a thorough analysis of recent news articles on {topic}. 
-                                    Extract key information, identify different perspectives, analyze sentiment, and provide 
-                                    a comprehensive summary with insights. Focus on credible sources and verify information 
-                                    across multiple outlets to ensure accuracy and completeness.
-                                    **Parameters**: 
-                                    - Topic: {topic}
-                                    - Article Count: {article_count}
-                                    - Focus Areas: {focus_areas}"""),
-                    agent=agent,
-                    expected_output=dedent("""A structured analysis including:
-                        - Key findings and insights
-                        - Perspectives and sentiment overview
-                        - Notable quotes and statistics
-                        - Summary with actionable takeaways"""))
-    
+        return self._task("analyze_articles", agent, topic=topic, article_count=article_count, focus_areas=focus_areas)
 
     def evaluate_sources(self, agent, topic, source_types, credibility_criteria):
         """
@@ -59,28 +63,8 @@ class NewsTasks:
             Returns:
             - Task: A CrewAI task assigned to the agent for news source evaluation.
         """
-        return Task(description = dedent(f"""**Task**: Evaluate News Source Credibility and Reliability
-                                     **Objective**: Analyze multiple news sources and assess their reliability 
-                                     for covering {topic}. Provide rankings based on credibility and quality metrics.
-
-                                     **Key Considerations**:
-                                        - Assess source credibility, fact-checking standards, and editorial policies.
-                                        - Analyze potential bias, political leanings, and reporting objectivity.
-                                        - Evaluate coverage quality, depth, and journalistic standards.
-                                        - Consider source track record and reputation in the industry.
-
-                                     **Evaluation Details**:
-                                        - Topic Focus: {topic}
-                                        - Source Types: {source_types}
-                                        - Credibility Criteria: {credibility_criteria}"""),
-                    agent=agent,
-                    expected_output=dedent("""A ranked list of sources with:
-                        - Credibility scores and justifications
-                        - Bias analysis and leanings
-                        - Reporting quality notes
-                        - Coverage breadth/depth assessment"""))
-
-    
+        return self._task("evaluate_sources", agent, topic=topic, source_types=source_types,
+                          credibility_criteria=credibility_criteria)
 
     def monitor_trending_topics(self, agent, categories, time_period, regions):
         """
@@ -99,25 +83,7 @@ class NewsTasks:
             Returns:
             - Task: A CrewAI task assigned to the agent for trending topic monitoring.
         """
-
-        return Task(description = dedent(f""" **Task**: Monitor and Analyze Trending News Topics  
-                                    **Objective**: Track trending topics across {categories} to identify emerging stories,
-                                    viral content, and developing news events. Provide insights into story momentum and public interest.
-                                    **Key Insights to Include**:
-                                            - Top trending topics and their growth patterns.
-                                            - Social media engagement metrics and viral potential.
-                                            - Geographic distribution of interest and regional variations.
-                                            - Timeline analysis showing how topics develop and spread.
-                                        **Monitoring Parameters**:
-                                            - Categories: {categories}
-                                            - Time Period: {time_period}
-                                            - Regions: {regions}"""),
-                    agent=agent,
-                    expected_output=dedent("""A trends report including:
-                        - Top trending topics with momentum
-                        - Engagement metrics
-                        - Regional interest patterns
-                        - Timeline of development"""))
+        return self._task("monitor_trending_topics", agent, categories=categories, time_period=time_period, regions=regions)
 
     def research_news(self, agent, topics):
         """
@@ -137,36 +103,7 @@ class NewsTasks:
             Returns:
             - Task: A CrewAI task for comprehensive news research
         """
-        return Task(
-            description=dedent(f"""**Task**: Comprehensive News Research and Analysis
-                            **Objective**: Research and analyze current news on the specified topics, providing 
-                            a detailed report with insights, trends, and key developments.
-
-                            **Research Requirements**:
-                            - Search for the latest news articles on each topic
-                            - Identify key trends, patterns, and developments
-                            - Analyze the significance and implications of major events
-                            - Summarize findings in a clear, structured format
-                            - Include relevant dates, sources, and context
-
-                            **Output Format**:
-                            - Executive summary of key findings
-                            - Detailed analysis for each topic
-                            - Timeline of important events
-                            - Trend analysis and implications
-                            - Source citations and reliability assessment
-
-                            **Research Parameters**:
-                            - Topics: {topics}
-                            - Focus: Current events and recent developments"""),
-            agent=agent,
-            expected_output=dedent("""A comprehensive report covering:
-                - Executive summary
-                - Topic-by-topic analysis
-                - Event timeline
-                - Trend implications
-                - Source citations"""),
-        )
+        return self._task("research_news", agent, topics=topics)
 
     def general_inquiry(self, agent, query):
         """
@@ -186,28 +123,4 @@ class NewsTasks:
             Returns:
             - Task: A CrewAI task for general inquiry answering
         """
-        return Task(
-            description=dedent(f"""**Task**: Answer General Inquiry Question
-                            **Objective**: Research and provide a comprehensive answer to the following question:
-                            
-                            {query}
-
-                            **Requirements**:
-                            - Search for accurate, relevant information
-                            - Synthesize information from multiple reliable sources
-                            - Provide clear, well-structured explanation
-                            - Include context, examples, and relevant details
-                            - Cite sources and maintain objectivity
-
-                            **Output Format**:
-                            - Direct answer to the question
-                            - Supporting details and explanation
-                            - Relevant context and examples
-                            - Source citations"""),
-            agent=agent,
-            expected_output=dedent("""A comprehensive answer including:
-                - Clear response to the inquiry
-                - Supporting details and explanation
-                - Relevant context and examples
-                - Source citations"""),
-        )
\ No newline at end of file
+        return self._task("general_inquiry", agent, query=query)
@@ -0,0 +1,79 @@
+"""Main-text extraction and excerpts against local HTML fixtures, via the injectable fetcher."""
+
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("httpx")
+pytest.importorskip("dotenv")
+
+import cache
+from cache import SharedCache
+from tools.article_content import afetch_excerpts, extract_main_text, fetch_excerpts
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+LONG = "This paragraph is comfortably longer than the forty character minimum."
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(autouse=True)
+def local_cache(monkeypatch):
+    monkeypatch.setattr(cache, "_cache", SharedCache(model="test", version="test"))
+
+
+def test_unclosed_paragraph_before_article_does_not_swallow_the_page():
+    html = f"<div class=byline><p>By someone</div><article><p>{LONG} One</p><p>{LONG} Two</p></article>"
+    assert extract_main_text(html) == [f"{LONG} One", f"{LONG} Two"]
+
+
+def test_unclosed_paragraphs_inside_article_are_split():
+    html = f"<article><p>{LONG} One<p>{LONG} Two</article><p>{LONG} Outside"
+    assert extract_main_text(html) == [f"{LONG} One", f"{LONG} Two"]
+
+
+def test_line_breaks_stay_in_one_paragraph():
+    assert extract_main_text(f"<p>{LONG}<br>Second line</p>") == [f"{LONG} Second line"]
+
+
+def test_fixture_page_keeps_article_text_only():
+    paragraphs = extract_main_text(_fixture("article_unclosed_tags.html"))
+    assert paragraphs[0].startswith("Chipmaker unveils new AI accelerator")
+    assert any(p.startswith('"This is the biggest jump') for p in paragraphs)
+    assert any(p.startswith("A smaller variant targets inference") for p in paragraphs)
+    assert not any("Jane Reporter" in p or "newsletter" in p or "Copyright" in p for p in paragraphs)
+
+
+def test_fetch_excerpts_with_local_fetcher():
+    html = _fixture("article_unclosed_tags.html")
+    results = [{"link": "https://example.com/chip"}, {"link": "https://example.com/missing"}, {"link": "ftp://x"}]
+    fetched = []
+
+    def fetcher(url):
+        fetched.append(url)
+        if url.endswith("missing"):
+            raise ValueError("404")
+        return html
+
+    excerpts = fetch_excerpts(results, "accelerator throughput", fetcher=fetcher)
+    assert list(excerpts) == ["https://example.com/chip"]
+    assert "40% more throughput" in excerpts["https://example.com/chip"]
+
+    # Extracted paragraphs are cached per URL
+    fetch_excerpts(results[:1], "shipments", fetcher=fetcher)
+    assert fetched.count("https://example.com/chip") == 1
+
+
+def test_afetch_excerpts_with_local_fetcher():
+    html = _fixture("article_unclosed_tags.html")
+
+    async def fetcher(url):
+        return html
+
+    excerpts = asyncio.run(afetch_excerpts([{"link": "https://example.com/chip"}], "memory bandwidth", fetcher=fetcher))
+    assert "8 TB/s" in excerpts["https://example.com/chip"]
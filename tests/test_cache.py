@@ -0,0 +1,135 @@
+"""Cache backends against local stand-ins: a socket RESP server and a temp SQLite file."""
+
+import socket
+import socketserver
+import threading
+
+import pytest
+
+import cache
+from cache import CacheUnavailable, RedisCache, SharedCache, SQLiteCache, backend_from_url
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    """Answers the subset of the Redis protocol RedisCache uses: AUTH, SELECT, GET, SET [PX], DEL."""
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        assert line.startswith(b"*")
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        server = self.server
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            name = args[0].upper()
+            server.commands.append(name)
+            if server.drop_next:
+                server.drop_next = False
+                return
+            if name == b"AUTH":
+                ok = args[1].decode() == server.password
+                self.wfile.write(b"+OK\r\n" if ok else b"-WRONGPASS invalid password\r\n")
+            elif name == b"SELECT":
+                self.wfile.write(b"+OK\r\n")
+            elif name == b"GET":
+                value = server.data.get(args[1])
+                if value is None:
+                    self.wfile.write(b"$-1\r\n")
+                else:
+                    self.wfile.write(b"$%d\r\n%s\r\n" % (len(value), value))
+            elif name == b"SET":
+                server.data[args[1]] = args[2]
+                self.wfile.write(b"+OK\r\n")
+            elif name == b"DEL":
+                removed = 1 if server.data.pop(args[1], None) is not None else 0
+                self.wfile.write(b":%d\r\n" % removed)
+            else:
+                self.wfile.write(b"-ERR unknown command\r\n")
+
+
+class _RespServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, password=None):
+        super().__init__(("127.0.0.1", 0), _RespHandler)
+        self.password = password
+        self.data = {}
+        self.commands = []
+        self.drop_next = False
+
+
+@pytest.fixture
+def resp_server():
+    server = _RespServer(password="secret")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_redis_round_trip_through_shared_cache(resp_server):
+    port = resp_server.server_address[1]
+    backend = RedisCache.from_url(f"redis://:secret@127.0.0.1:{port}/2")
+    writer = SharedCache(backend, model="m", version="1")
+    writer.set("tool:search_news", "ai chips", {"text": "x" * 500}, ttl=60)
+
+    # A second process only sees the value through the shared store
+    reader = SharedCache(backend, model="m", version="1")
+    assert reader.get("tool:search_news", "ai chips") == {"text": "x" * 500}
+    assert resp_server.commands[:2] == [b"AUTH", b"SELECT"]
+
+    reader.delete("tool:search_news", "ai chips")
+    assert SharedCache(backend, model="m", version="1").get("tool:search_news", "ai chips") is None
+
+
+def test_redis_reconnects_after_dropped_connection(resp_server):
+    backend = RedisCache("127.0.0.1", resp_server.server_address[1], password="secret")
+    backend.set("k", b"v")
+    resp_server.drop_next = True
+    with pytest.raises(CacheUnavailable):
+        backend.get("k")
+    assert backend.get("k") == b"v"
+
+
+def test_redis_error_reply_is_unavailable(resp_server):
+    backend = RedisCache("127.0.0.1", resp_server.server_address[1], password="wrong")
+    with pytest.raises(CacheUnavailable):
+        backend.get("k")
+
+
+def test_sqlite_expiry(tmp_path, monkeypatch):
+    backend = backend_from_url(f"sqlite:///{tmp_path / 'cache.db'}")
+    assert isinstance(backend, SQLiteCache)
+    now = 1000.0
+    monkeypatch.setattr(cache.time, "time", lambda: now)
+    backend.set("short", b"a", ttl=10)
+    backend.set("forever", b"b")
+    assert backend.get("short") == b"a"
+
+    now = 1011.0
+    assert backend.get("short") is None
+    assert backend.get("forever") == b"b"
+
+
+def test_falls_back_to_local_cache_when_store_unreachable():
+    shared = SharedCache(RedisCache("127.0.0.1", _unused_port(), timeout=0.2), model="m", version="1")
+    shared.set("router", "what is ai", "general", ttl=60)
+    assert shared.get("router", "what is ai") == "general"
+    assert not shared._shared_available()
@@ -0,0 +1,313 @@
+"""Optional full-text stage for search results.
+
+Fetches the linked pages of the top results concurrently, extracts the main
+article text with the standard library HTML parser and returns short,
+query-relevant excerpts. Enable it in the search tools with
+NEWS_FETCH_CONTENT=1.
+
+``afetch_excerpts()`` does the same on asyncio with httpx.
+
+Memory stays bounded: pages are streamed and cut off at ``max_bytes``, only
+``max_articles`` pages are fetched per call, at most ``per_host`` requests go
+to the same host at once, and only the trimmed excerpt is kept (and cached).
+"""
+
+import asyncio
+import contextvars
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+import requests
+
+from app_logging import get_logger
+from cache import get_cache
+from tools.providers import get_async_client
+from tools.ranking import bm25_scores, tokenize
+
+FETCH_CONTENT = os.getenv("NEWS_FETCH_CONTENT", "0").lower() in ("1", "true", "yes", "on")
+MAX_BYTES = 512 * 1024
+MIN_PARAGRAPH_CHARS = 40
+TTL_ARTICLE = 6 * 60 * 60
+
+logger = get_logger("tools.article_content")
+
+_SKIP_TAGS = frozenset(["script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "figure", "button"])
+_TEXT_TAGS = frozenset(["p", "li", "blockquote", "h1", "h2", "h3"])
+# Containers whose start or end also ends an unclosed paragraph
+_BLOCK_TAGS = frozenset(["div", "section", "main", "body", "ul", "ol", "table", "tr", "td", "dl", "pre", "hr"])
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class _HostLimiter:
+    """
+        Caps concurrent requests per host, shared by the thread-pool and asyncio paths.
+
+        Only hosts with requests in flight are tracked, so the table stays as small
+        as the number of concurrent fetches.
+    """
+
+    def __init__(self):
+        self._active = {}
+        self._condition = threading.Condition()
+
+    def _try_acquire(self, host, per_host):
+        if self._active.get(host, 0) >= per_host:
+            return False
+        self._active[host] = self._active.get(host, 0) + 1
+        return True
+
+    def _release(self, host):
+        with self._condition:
+            self._active[host] -= 1
+            if not self._active[host]:
+                del self._active[host]
+            self._condition.notify_all()
+
+    @contextmanager
+    def hold(self, url, per_host):
+        host = urlparse(url).netloc.lower()
+        with self._condition:
+            self._condition.wait_for(lambda: self._try_acquire(host, per_host))
+        try:
+            yield
+        finally:
+            self._release(host)
+
+    @asynccontextmanager
+    async def ahold(self, url, per_host, poll_interval=0.05):
+        host = urlparse(url).netloc.lower()
+        # Poll instead of blocking the event loop on the condition
+        while True:
+            with self._condition:
+                if self._try_acquire(host, per_host):
+                    break
+            await asyncio.sleep(poll_interval)
+        try:
+            yield
+        finally:
+            self._release(host)
+
+
+_host_limiter = _HostLimiter()
+
+
+class _MainTextParser(HTMLParser):
+    """
+        Collects paragraph-level text, remembering which paragraphs were inside <article>.
+
+        Closing tags like </p> and </li> are optional in HTML, so a paragraph also ends
+        where the next one starts or where its enclosing block or <article> ends.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphs = []
+        self._skip_depth = 0
+        self._article_depth = 0
+        self._buffer = None
+
+    def _flush(self):
+        if self._buffer is not None:
+            text = _WHITESPACE_RE.sub(" ", "".join(self._buffer)).strip()
+            if text:
+                self.paragraphs.append((text, self._article_depth > 0))
+            self._buffer = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "article":
+            self._flush()
+            self._article_depth += 1
+        elif tag in _TEXT_TAGS:
+            self._flush()
+            self._buffer = []
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+        elif tag == "br" and self._buffer is not None:
+            self._buffer.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "article":
+            self._flush()
+            self._article_depth = max(0, self._article_depth - 1)
+        elif tag in _TEXT_TAGS or tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._buffer is not None and not self._skip_depth:
+            self._buffer.append(data)
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._flush()
+
+
+def extract_main_text(html):
+    """
+        Extract the main body paragraphs from an HTML page.
+
+        Paragraphs inside <article> are preferred when the page has any; short
+        fragments (menus, bylines, captions) are dropped.
+
+        Returns:
+        - list: Paragraph strings in document order.
+    """
+    parser = _MainTextParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass
+    paragraphs = [(text, in_article) for text, in_article in parser.paragraphs if len(text) >= MIN_PARAGRAPH_CHARS]
+    if any(in_article for _, in_article in paragraphs):
+        paragraphs = [p for p in paragraphs if p[1]]
+    return [text for text, _ in paragraphs]
+
+
+def relevant_excerpt(paragraphs, query, max_chars=1200):
+    """
+        Trim article paragraphs to the parts most relevant to the query.
+
+        The lead paragraph is always kept. The rest are ranked by BM25 against the
+        query, with a small bonus for paragraphs containing figures or quotes, and
+        added until max_chars is reached. The excerpt keeps document order.
+    """
+    if not paragraphs:
+        return ""
+    scores = bm25_scores(tokenize(query), [tokenize(p) for p in paragraphs])
+    for i, paragraph in enumerate(paragraphs):
+        if re.search(r"\d", paragraph):
+            scores[i] += 0.5
+        if '"' in paragraph or "“" in paragraph:
+            scores[i] += 0.5
+
+    chosen = {0}
+    used = len(paragraphs[0])
+    for i in sorted(range(1, len(paragraphs)), key=lambda i: scores[i], reverse=True):
+        if used + len(paragraphs[i]) > max_chars:
+            continue
+        chosen.add(i)
+        used += len(paragraphs[i])
+
+    excerpt = " ... ".join(paragraphs[i] for i in sorted(chosen))
+    return excerpt[:max_chars]
+
+
+_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; news-search-agent)"}
+
+
+def fetch_page(url, max_bytes=MAX_BYTES, timeout=10):
+    """Stream an HTML page, stopping after max_bytes. Returns the decoded text."""
+    with requests.get(url, stream=True, timeout=timeout, headers=_HEADERS) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("content-type", "")
+        if "html" not in content_type:
+            raise ValueError(f"Unsupported content type '{content_type}'")
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=16384):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+        # requests falls back to ISO-8859-1 for text/html without a charset
+        encoding = response.encoding if "charset" in content_type.lower() else "utf-8"
+        return b"".join(chunks)[:max_bytes].decode(encoding, errors="replace")
+
+
+async def afetch_page(url, max_bytes=MAX_BYTES, timeout=10):
+    """Asyncio version of fetch_page(), using the shared httpx client."""
+    async with get_async_client().stream("GET", url, timeout=timeout, headers=_HEADERS,
+                                         follow_redirects=True) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("content-type", "")
+        if "html" not in content_type:
+            raise ValueError(f"Unsupported content type '{content_type}'")
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes(chunk_size=16384):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+        return b"".join(chunks)[:max_bytes].decode(response.encoding or "utf-8", errors="replace")
+
+
+def _store_paragraphs(url, html):
+    # Keep a bounded slice of the text, not the page, so later queries can re-trim it
+    paragraphs = extract_main_text(html)[:60]
+    get_cache().set("article", url, paragraphs, TTL_ARTICLE)
+    return paragraphs
+
+
+def _excerpt_for(url, query, max_chars, per_host, fetcher):
+    paragraphs = get_cache().get("article", url)
+    if paragraphs is None:
+        with _host_limiter.hold(url, per_host):
+            html = fetcher(url)
+        paragraphs = _store_paragraphs(url, html)
+    return relevant_excerpt(paragraphs, query, max_chars)
+
+
+def _links(results, max_articles):
+    return [r["link"] for r in results[:max_articles] if r.get("link", "").startswith("http")]
+
+
+def fetch_excerpts(results, query, max_articles=3, max_chars=1200, per_host=2, max_workers=6, fetcher=fetch_page):
+    """
+        Fetch the pages of the first max_articles results concurrently and extract excerpts.
+
+        Parameters:
+        - results (list): Normalized result dicts; only 'link' is used.
+        - query (str): The search query, used to pick relevant paragraphs.
+        - fetcher (callable): url -> html; replace it to test against local fixtures.
+
+        Returns:
+        - dict: Mapping of link to excerpt. Pages that fail to load are left out.
+    """
+    links = _links(results, max_articles)
+    if not links:
+        return {}
+
+    def task(url):
+        try:
+            return url, _excerpt_for(url, query, max_chars, per_host, fetcher)
+        except Exception as e:
+            logger.info("Could not fetch article content from %s: %s", url, e)
+            return url, ""
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(links))) as executor:
+        # Carry context variables (such as the logging run ID) into the pool threads
+        futures = [executor.submit(contextvars.copy_context().run, task, url) for url in links]
+        return {url: excerpt for url, excerpt in (f.result() for f in futures) if excerpt}
+
+
+async def afetch_excerpts(results, query, max_articles=3, max_chars=1200, per_host=2, fetcher=afetch_page):
+    """Asyncio version of fetch_excerpts(); fetcher is an async callable url -> html."""
+    links = _links(results, max_articles)
+
+    async def task(url):
+        try:
+            # Cache lookups and HTML parsing are blocking, so keep them off the event loop
+            paragraphs = await asyncio.to_thread(get_cache().get, "article", url)
+            if paragraphs is None:
+                async with _host_limiter.ahold(url, per_host):
+                    html = await fetcher(url)
+                paragraphs = await asyncio.to_thread(_store_paragraphs, url, html)
+            return url, relevant_excerpt(paragraphs, query, max_chars)
+        except Exception as e:
+            logger.info("Could not fetch article content from %s: %s", url, e)
+            return url, ""
+
+    pairs = await asyncio.gather(*(task(url) for url in links))
+    return {url: excerpt for url, excerpt in pairs if excerpt}
@@ -1,24 +1,168 @@
+import ast
+import json
+import math
+import operator
+from functools import lru_cache
 from crewai.tools.agent_tools import Tool
 from pydantic.v1 import BaseModel, Field
+from app_logging import verbose_for
+
+# Limits that keep a single expression bounded in time and memory
+MAX_EXPRESSION_LENGTH = 500
+MAX_EXPONENT = 100
+MAX_MAGNITUDE = 1e100
+MAX_OPERATIONS = 200
+MAX_BATCH_SIZE = 50
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
 
 class CalculatorInput(BaseModel):
-    expression: str = Field(..., description="A mathematical expression, e.g. 150+25 or 300/5*2")
+    expression: str = Field(
+        ...,
+        description=(
+            "A mathematical expression, e.g. 150+25 or 300/5*2. To evaluate several at once, "
+            "separate them with semicolons or pass a JSON list, e.g. (120-100)/100*100; (90-100)/100*100"
+        ),
+    )
+
+
+class CalculationError(ValueError):
+    """Raised when an expression is not allowed or exceeds the evaluation limits."""
+
+
+@lru_cache(maxsize=512)
+def _compile(expression: str):
+    """Parse an expression once and validate that it only uses arithmetic nodes."""
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise CalculationError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError:
+        raise CalculationError("Invalid expression syntax")
+
+    operations = 0
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.BinOp, ast.UnaryOp)):
+            allowed = _BINARY_OPS if isinstance(node, ast.BinOp) else _UNARY_OPS
+            if type(node.op) not in allowed:
+                raise CalculationError(f"Unsupported operator: {type(node.op).__name__}")
+            operations += 1
+        elif isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise CalculationError("Only numeric literals are supported")
+        elif not isinstance(node, (ast.Expression, ast.operator, ast.unaryop)):
+            raise CalculationError(f"Unsupported syntax: {type(node).__name__}")
+    if operations > MAX_OPERATIONS:
+        raise CalculationError(f"Expression uses more than {MAX_OPERATIONS} operations")
+    return tree.body
+
+
+def _check_magnitude(value):
+    # e.g. (-8)**0.5 yields a complex number, which the agent cannot use
+    if not isinstance(value, (int, float)):
+        raise CalculationError("Result is not a real number")
+    if abs(value) > MAX_MAGNITUDE:
+        raise CalculationError(f"Result magnitude exceeds {MAX_MAGNITUDE:g}")
+    return value
+
+
+def _evaluate_node(node):
+    if isinstance(node, ast.Constant):
+        return _check_magnitude(node.value)
+    if isinstance(node, ast.UnaryOp):
+        return _UNARY_OPS[type(node.op)](_evaluate_node(node.operand))
+    if isinstance(node, ast.BinOp):
+        op_type = type(node.op)
+        if op_type not in _BINARY_OPS:
+            raise CalculationError(f"Unsupported operator: {op_type.__name__}")
+        left = _evaluate_node(node.left)
+        right = _evaluate_node(node.right)
+        if op_type is ast.Pow:
+            # Check before computing: 9**9**9 must never reach int.__pow__
+            if abs(right) > MAX_EXPONENT:
+                raise CalculationError(f"Exponent larger than {MAX_EXPONENT}")
+            if abs(left) > 1 and abs(right) * math.log10(abs(left)) > math.log10(MAX_MAGNITUDE):
+                raise CalculationError(f"Result magnitude exceeds {MAX_MAGNITUDE:g}")
+        return _check_magnitude(_BINARY_OPS[op_type](left, right))
+    raise CalculationError(f"Unsupported syntax: {type(node).__name__}")
+
+
+def evaluate(expression: str):
+    """Safely evaluate a single arithmetic expression within the configured limits."""
+    expression = expression.strip()
+    if not expression:
+        raise CalculationError("Empty expression")
+    try:
+        result = _evaluate_node(_compile(expression))
+    except OverflowError:
+        # e.g. 1e-99**-100 overflows the float range before the magnitude check
+        raise CalculationError(f"Result magnitude exceeds {MAX_MAGNITUDE:g}")
+    if isinstance(result, float) and result.is_integer() and abs(result) < 1e15:
+        return int(result)
+    return result
+
+
+def evaluate_batch(expressions):
+    """Evaluate a list of expressions, returning a result or an error message for each."""
+    if len(expressions) > MAX_BATCH_SIZE:
+        raise CalculationError(f"Batch larger than {MAX_BATCH_SIZE} expressions")
+    results = []
+    for expression in expressions:
+        try:
+            results.append(evaluate(expression))
+        except ZeroDivisionError:
+            results.append("Error: division by zero")
+        except (CalculationError, ArithmeticError) as e:
+            results.append(f"Error: {e}")
+    return results
+
+
+def _split_expressions(expression: str):
+    """Accept a single expression, a semicolon/newline separated list, or a JSON list."""
+    text = expression.strip()
+    if text.startswith("["):
+        try:
+            items = json.loads(text)
+            if isinstance(items, list):
+                return [str(item) for item in items]
+        except json.JSONDecodeError:
+            pass
+    return [part for part in text.replace("\n", ";").split(";") if part.strip()]
+
 
 def _calculate(expression: str):
-    """Perform a calculation from a simple expression string."""
+    """Perform one or more calculations from a simple expression string."""
     try:
-        # Be explicit about allowed characters to reduce abuse risk in eval
-        allowed_chars = set("0123456789+-*/(). %")
-        if not set(expression) <= allowed_chars:
-            return "Error: Expression contains unsupported characters"
-        return str(eval(expression))
+        expressions = _split_expressions(expression)
+        if len(expressions) <= 1:
+            return str(evaluate(expressions[0] if expressions else ""))
+        results = evaluate_batch(expressions)
+        return '\n'.join(f"{expr.strip()} = {result}" for expr, result in zip(expressions, results))
+    except ZeroDivisionError:
+        return "Error: division by zero"
     except Exception as e:
         return f"Error: {e}"
 
 calculator_tool = Tool(
     name="calculate",
     func=_calculate,
-    description="Perform arithmetic calculations provided as an expression string",
+    description=(
+        "Perform arithmetic calculations provided as an expression string. "
+        "Supports + - * / // % ** and parentheses; separate multiple expressions with semicolons"
+    ),
     args_schema=CalculatorInput,
-    verbose=True,
+    verbose=verbose_for("tools"),
 )
@@ -0,0 +1,455 @@
+"""Search providers behind a shared result schema.
+
+Every provider returns a list of plain dicts with the keys:
+title, link, snippet, published, source, provider.
+
+Providers are looked up by name in ``PROVIDERS``. ``search()`` queries a list
+of candidate providers in one of three modes:
+
+- ``single``: best provider first (by observed latency and error rate), falling back on errors
+- ``fanout``: all providers concurrently, results merged and de-duplicated by link
+- ``hedge``:  all providers concurrently, the first successful answer wins
+
+``asearch()`` is the asyncio equivalent, built on a shared httpx.AsyncClient.
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import requests
+from dotenv import load_dotenv
+
+from app_logging import redact
+
+load_dotenv()
+
+DEFAULT_TIMEOUT = 15
+SEARCH_MODES = ("single", "fanout", "hedge")
+
+# Shared pool for fan-out and hedged requests; hedged losers finish in the background
+_executor = ThreadPoolExecutor(max_workers=int(os.getenv("SEARCH_PROVIDER_WORKERS", "8")),
+                               thread_name_prefix="search-provider")
+
+# One pooled async client per event loop
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client():
+    """Return the shared httpx.AsyncClient for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+class ProviderError(Exception):
+    """Raised when a provider cannot return results for a query."""
+
+    def __init__(self, message):
+        # The message becomes the tool observation the LLM sees, and requests errors include the full URL
+        super().__init__(redact(str(message)))
+
+
+class SearchProvider:
+    """Base class: subclasses describe the HTTP request and how to parse the response."""
+
+    name = None
+
+    def is_configured(self):
+        return True
+
+    def build_request(self, query, max_results):
+        """Return a dict with method, url and optional params, json and headers."""
+        raise NotImplementedError
+
+    def parse_response(self, status_code, data):
+        """Turn a decoded JSON body into a list of normalized result dicts."""
+        raise NotImplementedError
+
+    def search(self, query, max_results, timeout=DEFAULT_TIMEOUT):
+        request = self.build_request(query, max_results)
+        try:
+            response = requests.request(
+                request["method"],
+                request["url"],
+                params=request.get("params"),
+                json=request.get("json"),
+                headers=request.get("headers"),
+                timeout=timeout,
+            )
+        except requests.exceptions.RequestException as e:
+            raise ProviderError(f"Error making {self.name} request: {e}")
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        return self.parse_response(response.status_code, data)
+
+    async def asearch(self, query, max_results, timeout=DEFAULT_TIMEOUT):
+        request = self.build_request(query, max_results)
+        try:
+            response = await get_async_client().request(
+                request["method"],
+                request["url"],
+                params=request.get("params"),
+                json=request.get("json"),
+                headers=request.get("headers"),
+                timeout=timeout,
+            )
+        except httpx.HTTPError as e:
+            raise ProviderError(f"Error making {self.name} request: {e}")
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        return self.parse_response(response.status_code, data)
+
+    def _result(self, title, link, snippet, published, source):
+        return {
+            "title": title or "",
+            "link": link or "",
+            "snippet": snippet or "",
+            "published": published or "",
+            "source": source or "",
+            "provider": self.name,
+        }
+
+
+class GNewsProvider(SearchProvider):
+    name = "gnews"
+    days = 7
+
+    def __init__(self):
+        self.api_key = os.getenv("GNEWS_API_KEY", "67b00b586b42fb594924a68f79458260")
+
+    def is_configured(self):
+        return bool(self.api_key)
+
+    def build_request(self, query, max_results):
+        # Default to last 7 days and sort newest first
+        now = datetime.now(timezone.utc)
+        return {
+            "method": "GET",
+            "url": "https://gnews.io/api/v4/search",
+            "params": {
+                "q": query,
+                "lang": "en",
+                "max": max_results,
+                "sortby": "publishedAt",
+                "from": (now - timedelta(days=self.days)).isoformat(timespec="seconds").replace("+00:00", "Z"),
+                "to": now.isoformat(timespec="seconds").replace("+00:00", "Z"),
+                "apikey": self.api_key,
+            },
+        }
+
+    def parse_response(self, status_code, data):
+        if status_code != 200:
+            raise ProviderError(f"Error: GNews API returned status code {status_code}")
+        if not isinstance(data, dict):
+            raise ProviderError("Error: Invalid JSON response from news API")
+        if "articles" not in data:
+            raise ProviderError("Error: Could not retrieve news articles. Please check your GNews API key.")
+        return [
+            self._result(
+                article.get("title"),
+                article.get("url"),
+                article.get("description"),
+                article.get("publishedAt"),
+                (article.get("source") or {}).get("name"),
+            )
+            for article in data["articles"]
+            if article.get("title") and article.get("url")
+        ]
+
+
+class SerperProvider(SearchProvider):
+    """Shared client for Serper's web and news endpoints."""
+
+    url = None
+    result_key = None
+    extra_payload = {}
+
+    def __init__(self):
+        self.api_key = os.getenv("SERPER_API_KEY")
+
+    def is_configured(self):
+        return bool(self.api_key)
+
+    def build_request(self, query, max_results):
+        return {
+            "method": "POST",
+            "url": self.url,
+            "json": {"q": query, "num": max_results, **self.extra_payload},
+            "headers": {"X-API-KEY": self.api_key or "", "content-type": "application/json"},
+        }
+
+    def parse_response(self, status_code, data):
+        if status_code == 403:
+            raise ProviderError("Error: Access forbidden (403). Please verify your Serper API key is valid and has available credits.")
+        if status_code == 401:
+            raise ProviderError("Error: Unauthorized (401). Your Serper API key is invalid.")
+        if status_code != 200:
+            raise ProviderError(f"Error: Search API returned status code {status_code}")
+        if not isinstance(data, dict):
+            raise ProviderError("Error: Invalid JSON response from search API")
+        if self.result_key not in data:
+            raise ProviderError("Error: Could not retrieve search results. Response may be incomplete.")
+        return [
+            self._result(item.get("title"), item.get("link"), item.get("snippet"), item.get("date"), item.get("source"))
+            for item in data[self.result_key]
+        ]
+
+
+class SerperWebProvider(SerperProvider):
+    name = "serper_web"
+    url = "https://google.serper.dev/search"
+    result_key = "organic"
+
+
+class SerperNewsProvider(SerperProvider):
+    name = "serper_news"
+    url = "https://google.serper.dev/news"
+    result_key = "news"
+    # Match GNews: restrict to the past week
+    extra_payload = {"tbs": "qdr:w"}
+
+
+class ProviderStats:
+    """
+        Exponentially weighted latency and error rate for one provider.
+
+        The error rate also decays with time (halving every ``error_half_life``
+        seconds), so a provider that stopped getting traffic after a failure is
+        tried again instead of staying last forever.
+    """
+
+    def __init__(self, alpha=0.2, initial_latency=1.0, error_half_life=60.0):
+        self.alpha = alpha
+        self.latency = initial_latency
+        self.error_rate = 0.0
+        self.error_half_life = error_half_life
+        self.calls = 0
+        self.errors = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _current_error_rate(self, now):
+        return self.error_rate * 0.5 ** ((now - self._updated) / self.error_half_life)
+
+    def record(self, latency, ok):
+        with self._lock:
+            now = time.monotonic()
+            self.calls += 1
+            if not ok:
+                self.errors += 1
+            else:
+                self.latency += self.alpha * (latency - self.latency)
+            error_rate = self._current_error_rate(now)
+            self.error_rate = error_rate + self.alpha * ((0.0 if ok else 1.0) - error_rate)
+            self._updated = now
+
+    def score(self):
+        """Lower is better: expected latency, inflated by recent failures."""
+        with self._lock:
+            return self.latency * (1.0 + 4.0 * self._current_error_rate(time.monotonic()))
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "latency": round(self.latency, 3),
+                "error_rate": round(self._current_error_rate(time.monotonic()), 3),
+            }
+
+
+PROVIDERS = {
+    provider.name: provider
+    for provider in (GNewsProvider(), SerperWebProvider(), SerperNewsProvider())
+}
+STATS = {name: ProviderStats() for name in PROVIDERS}
+
+
+def provider_stats():
+    """Return a snapshot of the latency/error stats of every provider."""
+    return {name: stats.snapshot() for name, stats in STATS.items()}
+
+
+def select_providers(candidates):
+    """Order configured candidate providers from most to least promising."""
+    configured = [name for name in candidates if name in PROVIDERS and PROVIDERS[name].is_configured()]
+    return sorted(configured, key=lambda name: STATS[name].score())
+
+
+def _timed_search(name, query, max_results):
+    started = time.perf_counter()
+    try:
+        results = PROVIDERS[name].search(query, max_results)
+    except ProviderError:
+        STATS[name].record(time.perf_counter() - started, ok=False)
+        raise
+    except Exception as e:
+        STATS[name].record(time.perf_counter() - started, ok=False)
+        raise ProviderError(f"Error from {name}: {e}")
+    STATS[name].record(time.perf_counter() - started, ok=True)
+    return results
+
+
+async def _atimed_search(name, query, max_results):
+    started = time.perf_counter()
+    try:
+        results = await PROVIDERS[name].asearch(query, max_results)
+    except ProviderError:
+        STATS[name].record(time.perf_counter() - started, ok=False)
+        raise
+    except Exception as e:
+        STATS[name].record(time.perf_counter() - started, ok=False)
+        raise ProviderError(f"Error from {name}: {e}")
+    STATS[name].record(time.perf_counter() - started, ok=True)
+    return results
+
+
+def _merge(result_lists):
+    merged = []
+    seen = set()
+    for results in result_lists:
+        for result in results:
+            key = result["link"].rstrip("/").lower()
+            if key and key not in seen:
+                seen.add(key)
+                merged.append(result)
+    return merged
+
+
+def _submit(func, *args):
+    # Carry context variables (such as the logging run ID) into the pool thread
+    return _executor.submit(contextvars.copy_context().run, func, *args)
+
+
+def _search_single(query, names, max_results):
+    errors = []
+    for name in names:
+        try:
+            return _timed_search(name, query, max_results)
+        except ProviderError as e:
+            errors.append(str(e))
+    raise ProviderError("; ".join(errors))
+
+
+def _search_fanout(query, names, max_results):
+    futures = [_submit(_timed_search, name, query, max_results) for name in names]
+    result_lists, errors = [], []
+    for future in futures:
+        try:
+            result_lists.append(future.result())
+        except ProviderError as e:
+            errors.append(str(e))
+    if not result_lists:
+        raise ProviderError("; ".join(errors))
+    return _merge(result_lists)
+
+
+def _search_hedge(query, names, max_results):
+    pending = {_submit(_timed_search, name, query, max_results) for name in names}
+    errors = []
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                return future.result()
+            except ProviderError as e:
+                errors.append(str(e))
+    raise ProviderError("; ".join(errors))
+
+
+async def _asearch_single(query, names, max_results):
+    errors = []
+    for name in names:
+        try:
+            return await _atimed_search(name, query, max_results)
+        except ProviderError as e:
+            errors.append(str(e))
+    raise ProviderError("; ".join(errors))
+
+
+async def _asearch_fanout(query, names, max_results):
+    outcomes = await asyncio.gather(
+        *(_atimed_search(name, query, max_results) for name in names), return_exceptions=True
+    )
+    result_lists = [outcome for outcome in outcomes if not isinstance(outcome, BaseException)]
+    if not result_lists:
+        raise ProviderError("; ".join(str(outcome) for outcome in outcomes))
+    return _merge(result_lists)
+
+
+async def _asearch_hedge(query, names, max_results):
+    pending = {asyncio.ensure_future(_atimed_search(name, query, max_results)) for name in names}
+    errors = []
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    return task.result()
+                except ProviderError as e:
+                    errors.append(str(e))
+    finally:
+        # Unlike the threaded version, slower requests can actually be cancelled
+        for task in pending:
+            task.cancel()
+    raise ProviderError("; ".join(errors))
+
+
+def _resolve(candidates, mode):
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode '{mode}', expected one of {SEARCH_MODES}")
+    names = select_providers(candidates)
+    if not names:
+        raise ProviderError(f"Error: No configured search provider among {list(candidates)}")
+    return names
+
+
+def search(query, candidates, max_results, mode="single"):
+    """
+        Search the candidate providers using the given mode.
+
+        Parameters:
+        - query (str): The search query.
+        - candidates (list): Provider names to consider, e.g. ["gnews", "serper_news"].
+        - max_results (int): Results to request from each provider.
+        - mode (str): One of "single", "fanout" or "hedge".
+
+        Returns:
+        - list: Normalized result dicts.
+
+        Raises:
+        - ProviderError: If no configured provider could answer.
+    """
+    names = _resolve(candidates, mode)
+    if mode == "single" or len(names) == 1:
+        return _search_single(query, names, max_results)
+    if mode == "fanout":
+        return _search_fanout(query, names, max_results)
+    return _search_hedge(query, names, max_results)
+
+
+async def asearch(query, candidates, max_results, mode="single"):
+    """Asyncio version of search(), with the same arguments and errors."""
+    names = _resolve(candidates, mode)
+    if mode == "single" or len(names) == 1:
+        return await _asearch_single(query, names, max_results)
+    if mode == "fanout":
+        return await _asearch_fanout(query, names, max_results)
+    return await _asearch_hedge(query, names, max_results)
@@ -0,0 +1,173 @@
+import math
+import re
+from datetime import datetime, timezone
+
+# Results are plain dicts with the keys: title, link, snippet, published, source.
+# The search tools map their raw API payloads into this shape before ranking.
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_RELATIVE_DATE_RE = re.compile(r"(\d+)\s+(minute|hour|day|week|month|year)s?\s+ago")
+_RELATIVE_UNITS = {
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 30 * 86400,
+    "year": 365 * 86400,
+}
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it of on or that the to was were will with".split()
+)
+
+
+def tokenize(text):
+    """Lowercase and split text into alphanumeric tokens, dropping common stopwords."""
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+def parse_published(value, now=None):
+    """
+    Parse a publish date into an aware datetime.
+
+    Accepts ISO-8601 strings (GNews ``publishedAt``), Serper's relative
+    strings ("3 hours ago") and short dates ("Mar 3, 2024").
+    Returns None when the value cannot be understood.
+    """
+    if not value:
+        return None
+    now = now or datetime.now(timezone.utc)
+    text = str(value).strip()
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    except ValueError:
+        pass
+    match = _RELATIVE_DATE_RE.search(text.lower())
+    if match:
+        seconds = int(match.group(1)) * _RELATIVE_UNITS[match.group(2)]
+        return datetime.fromtimestamp(now.timestamp() - seconds, tz=timezone.utc)
+    for fmt in ("%b %d, %Y", "%B %d, %Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+def bm25_scores(query_tokens, documents, k1=1.5, b=0.75):
+    """Score every tokenized document against the query in one pass over the batch."""
+    n_docs = len(documents)
+    if not n_docs or not query_tokens:
+        return [0.0] * n_docs
+
+    lengths = [len(doc) for doc in documents]
+    avg_len = (sum(lengths) / n_docs) or 1.0
+    term_counts = []
+    doc_freq = {}
+    for doc in documents:
+        counts = {}
+        for token in doc:
+            counts[token] = counts.get(token, 0) + 1
+        term_counts.append(counts)
+        for token in counts:
+            doc_freq[token] = doc_freq.get(token, 0) + 1
+
+    unique_terms = set(query_tokens)
+    idf = {
+        term: math.log(1 + (n_docs - doc_freq.get(term, 0) + 0.5) / (doc_freq.get(term, 0) + 0.5))
+        for term in unique_terms
+    }
+    norms = [k1 * (1 - b + b * length / avg_len) for length in lengths]
+
+    return [
+        sum(
+            idf[term] * counts[term] * (k1 + 1) / (counts[term] + norm)
+            for term in unique_terms
+            if term in counts
+        )
+        for counts, norm in zip(term_counts, norms)
+    ]
+
+
+def _recency_scores(published, now, half_life_hours):
+    """Exponential decay by article age; undated results get a neutral score."""
+    decay = math.log(2) / (half_life_hours * 3600.0)
+    scores = []
+    for value in published:
+        when = parse_published(value, now)
+        if when is None:
+            scores.append(0.5)
+        else:
+            age = max(0.0, (now - when).total_seconds())
+            scores.append(math.exp(-decay * age))
+    return scores
+
+
+def rank_results(
+    query,
+    results,
+    top_k,
+    relevance_weight=0.7,
+    recency_weight=0.3,
+    half_life_hours=48.0,
+    diversity_penalty=0.7,
+    now=None,
+):
+    """
+        Re-rank an over-fetched batch of search results and return the best top_k.
+
+        Each result is scored as a weighted mix of:
+        - BM25 relevance of title + snippet against the query (normalized to 0-1 over the batch)
+        - Recency, decaying exponentially with a configurable half-life
+
+        Selection is then greedy: every time a source is picked, the remaining results from
+        that same source are multiplied by ``diversity_penalty`` so one outlet cannot fill
+        the whole list.
+
+        Parameters:
+        - query (str): The search query.
+        - results (list): Normalized result dicts (title, link, snippet, published, source).
+        - top_k (int): Number of results to return.
+
+        Returns:
+        - list: Up to top_k result dicts, best first.
+    """
+    if not results or top_k <= 0:
+        return []
+    now = now or datetime.now(timezone.utc)
+
+    documents = [
+        tokenize(f"{r.get('title', '')} {r.get('title', '')} {r.get('snippet', '')}")
+        for r in results
+    ]
+    relevance = bm25_scores(tokenize(query), documents)
+    top_relevance = max(relevance) or 1.0
+    recency = _recency_scores([r.get("published") for r in results], now, half_life_hours)
+
+    base = [
+        relevance_weight * (rel / top_relevance) + recency_weight * rec
+        for rel, rec in zip(relevance, recency)
+    ]
+
+    selected = []
+    source_picks = {}
+    remaining = list(range(len(results)))
+    while remaining and len(selected) < top_k:
+        best = max(
+            remaining,
+            key=lambda i: base[i] * diversity_penalty ** source_picks.get(_source_key(results[i]), 0),
+        )
+        remaining.remove(best)
+        selected.append(results[best])
+        key = _source_key(results[best])
+        source_picks[key] = source_picks.get(key, 0) + 1
+    return selected
+
+
+def _source_key(result):
+    source = (result.get("source") or "").strip().lower()
+    if source:
+        return source
+    link = result.get("link") or ""
+    match = re.match(r"https?://(?:www\.)?([^/]+)", link)
+    return match.group(1).lower() if match else link
@@ -1,10 +1,14 @@
-import json
-import requests
+import asyncio
 import os
 from dotenv import load_dotenv
 from crewai.tools.agent_tools import Tool
 from typing import Type
 from pydantic.v1 import BaseModel, Field
+from tools.ranking import rank_results
+from tools.providers import ProviderError, asearch, search
+from cache import TTL_TOOL, get_cache
+from app_logging import get_logger, verbose_for
+from tools.article_content import FETCH_CONTENT, afetch_excerpts, fetch_excerpts
 
 # Load environment variables
 load_dotenv()
@@ -12,69 +16,92 @@ SERPER_API_KEY = os.getenv("SERPER_API_KEY")
 if not SERPER_API_KEY:
     raise ValueError("SERPER_API_KEY environment variable not set. Please add it to your .env file.")
 
+logger = get_logger("tools.search_internet")
+
 class SearchInput(BaseModel):
     """Input schema for search tool."""
     query: str = Field(..., description="The search query for finding information on the internet")
 
 
+TOP_RESULTS = 4
+# Over-fetch so local ranking can surface relevant results that Serper lists further down
+FETCH_RESULTS = 10
+
+
+def _cache_key(query: str) -> str:
+    return f"{FETCH_CONTENT}|{query.strip().lower()}"
+
+
+def _format_results(ranked, excerpts) -> str:
+    string = []
+    for result in ranked:
+        lines = [f"Title: {result['title']}", f"Link: {result['link']}", f"Snippet: {result['snippet']}"]
+        if result['link'] in excerpts:
+            lines.append(f"Excerpt: {excerpts[result['link']]}")
+        lines.append("\n-----------------")
+        string.append('\n'.join(lines))
+    return '\n'.join(string)
+
+
 def _search_internet(query: str) -> str:
     """Execute the internet search and return relevant results."""
-    print(f"🌐 SearchInternet called with query: '{query}'")
-    top_result_to_return = 4
-    url = "https://google.serper.dev/search"
-    payload = json.dumps({"q": query})
-    headers = {
-        'X-API-KEY': SERPER_API_KEY,
-        'content-type': 'application/json'
-    }
-    print(f"Making search request to URL: {url} with query: {query}")
+    logger.info("search_internet called with query %r", query)
+    cache_key = _cache_key(query)
+    cached = get_cache().get("tool:search_internet", cache_key)
+    if cached is not None:
+        logger.debug("Returning cached search results")
+        return cached
+
     try:
-        response = requests.request("POST", url, headers=headers, data=payload)
-    except Exception as e:
-        return f"Error making search request: {e}"
-
-    # Check HTTP status code
-    if response.status_code != 200:
-        print(f"Search API returned status code {response.status_code}")
-        if response.status_code == 403:
-            return "Error: Access forbidden (403). Please verify your Serper API key is valid and has available credits."
-        elif response.status_code == 401:
-            return "Error: Unauthorized (401). Your Serper API key is invalid."
-        else:
-            return f"Error: Search API returned status code {response.status_code}"
+        results = search(query, ["serper_web"], FETCH_RESULTS)
+    except ProviderError as e:
+        logger.warning(str(e))
+        return str(e)
+
+    logger.debug("Found %d search results", len(results))
+
+    # Score by relevance, recency and source diversity, then keep the best few
+    ranked = rank_results(query, results, TOP_RESULTS)
+
+    # Optionally pull main-text excerpts from the top pages
+    excerpts = fetch_excerpts(ranked, query) if FETCH_CONTENT else {}
+
+    search_result = _format_results(ranked, excerpts)
+    logger.debug("Returning %d characters of search results", len(search_result))
+    get_cache().set("tool:search_internet", cache_key, search_result, TTL_TOOL)
+    return search_result
+
+
+async def _asearch_internet(query: str) -> str:
+    """Asyncio version of _search_internet, used when the tool is awaited."""
+    logger.info("search_internet (async) called with query %r", query)
+    cache_key = _cache_key(query)
+    cached = await asyncio.to_thread(get_cache().get, "tool:search_internet", cache_key)
+    if cached is not None:
+        logger.debug("Returning cached search results")
+        return cached
 
     try:
-        json_resp = response.json()
-    except json.JSONDecodeError:
-        return "Error: Invalid JSON response from search API"
+        results = await asearch(query, ["serper_web"], FETCH_RESULTS)
+    except ProviderError as e:
+        logger.warning(str(e))
+        return str(e)
 
-    # Check if the response was successful and contains the expected data
-    if 'organic' not in json_resp:
-        return "Error: Could not retrieve search results. Response may be incomplete."
+    logger.debug("Found %d search results", len(results))
+    ranked = rank_results(query, results, TOP_RESULTS)
+    excerpts = await afetch_excerpts(ranked, query) if FETCH_CONTENT else {}
 
-    results = json_resp['organic']
-    print(f"Found {len(results)} search results")
-    
-    string = []
-    for result in results[:top_result_to_return]:
-        try:
-            string.append('\n'.join([
-                f"Title: {result.get('title','')}", f"Link: {result.get('link','')}",
-                f"Snippet: {result.get('snippet','')}", "\n-----------------"
-            ]))
-        except KeyError:
-            continue
-
-    search_result = '\n'.join(string)
-    print(f"Returning {len(search_result)} characters of search results")
+    search_result = _format_results(ranked, excerpts)
+    logger.debug("Returning %d characters of search results", len(search_result))
+    await asyncio.to_thread(get_cache().set, "tool:search_internet", cache_key, search_result, TTL_TOOL)
     return search_result
 
 # Expose Tool instance
 search_internet_tool = Tool(
     name="search_internet",
     func=_search_internet,
+    coroutine=_asearch_internet,
     description="Search the internet about a given topic and return relevant results",
     args_schema=SearchInput,
-    verbose=True,
+    verbose=verbose_for("tools"),
 )
-
@@ -1,96 +1,121 @@
-import json
-import requests
-import urllib.parse
-from datetime import datetime, timedelta, timezone
 from crewai.tools.agent_tools import Tool
 from typing import Type
 from pydantic.v1 import BaseModel, Field
 from dotenv import load_dotenv
+import asyncio
 import os
+from tools.ranking import rank_results
+from tools.providers import SEARCH_MODES, ProviderError, asearch, search
+from cache import TTL_TOOL, get_cache
+from app_logging import get_logger, verbose_for
+from tools.article_content import FETCH_CONTENT, afetch_excerpts, fetch_excerpts
 
-# Load API keys from environment, fall back to existing hard-coded values if needed
 load_dotenv()
-GNEWS_API_KEY = os.getenv("GNEWS_API_KEY", "67b00b586b42fb594924a68f79458260")
+# Providers the news tool may use, and how to combine them: single, fanout or hedge
+NEWS_PROVIDERS = [name.strip() for name in os.getenv("NEWS_SEARCH_PROVIDERS", "gnews,serper_news").split(",") if name.strip()]
+NEWS_SEARCH_MODE = os.getenv("NEWS_SEARCH_MODE", "single").strip().lower()
+if NEWS_SEARCH_MODE not in SEARCH_MODES:
+    raise ValueError(f"NEWS_SEARCH_MODE must be one of {', '.join(SEARCH_MODES)}, got '{NEWS_SEARCH_MODE}'.")
+
+logger = get_logger("tools.search_news")
 
 class NewsSearchInput(BaseModel):
     """Input schema for news search tool."""
     query: str = Field(..., description="The search query for finding news articles")
 
 
+MAX_RESULTS = 5
+# Over-fetch so local ranking can surface relevant articles that providers list further down
+FETCH_RESULTS = 10
+
+
+def _cache_key(query: str) -> str:
+    return f"{NEWS_SEARCH_MODE}|{','.join(NEWS_PROVIDERS)}|{FETCH_CONTENT}|{query.strip().lower()}"
+
+
+def _format_articles(ranked, excerpts) -> str:
+    string = []
+    for article in ranked:
+        lines = [
+            f"Title: {article['title']}",
+            f"Link: {article['link']}",
+            f"Description: {article['snippet']}",
+            f"Published: {article['published']}",
+            f"Source: {article['source']}",
+        ]
+        if article['link'] in excerpts:
+            lines.append(f"Excerpt: {excerpts[article['link']]}")
+        lines.append("\n-----------------")
+        string.append('\n'.join(lines))
+    return '\n'.join(string)
+
+
 def _search_news(query: str) -> str:
     """Execute the news search and return recent articles."""
-    print(f"🔍 SearchNews tool called with query: '{query}'")
-    max_results = 5
-    encoded_query = urllib.parse.quote_plus(query)
-    # Default to last 7 days and sort newest first
-    to_date = datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
-    from_date = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat(timespec='seconds').replace('+00:00', 'Z')
-
-    url = (
-        "https://gnews.io/api/v4/search"
-        f"?q={encoded_query}"
-        f"&lang=en"
-        f"&max={max_results}"
-        f"&sortby=publishedAt"
-        f"&from={from_date}"
-        f"&to={to_date}"
-        f"&apikey={GNEWS_API_KEY}"
-    )
-    
-    print(f"Making news request to URL: {url}")
-    
+    logger.info("search_news called with query %r (mode: %s)", query, NEWS_SEARCH_MODE)
+    cache_key = _cache_key(query)
+    cached = get_cache().get("tool:search_news", cache_key)
+    if cached is not None:
+        logger.debug("Returning cached news results")
+        return cached
+
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Check if the response contains articles
-        if 'articles' not in data:
-            return "Error: Could not retrieve news articles. Please check your GNews API key."
-        
-        articles = data['articles']
-        print(f"Found {len(articles)} articles")
-        
-        # Ensure most recent first even if API default changes
-        try:
-            articles.sort(key=lambda a: a.get('publishedAt', ''), reverse=True)
-        except Exception:
-            pass
-        if not articles:
-            return "No news articles found for the given query."
-        
-        string = []
-        for article in articles:
-            try:
-                string.append('\n'.join([
-                    f"Title: {article['title']}", 
-                    f"Link: {article['url']}",
-                    f"Description: {article.get('description','')}", 
-                    f"Published: {article.get('publishedAt','')}",
-                    f"Source: {article.get('source',{}).get('name','')}",
-                    "\n-----------------"
-                ]))
-            except KeyError:
-                continue
-        
-        result = '\n'.join(string)
-        print(f"Returning {len(result)} characters of results")
-        return result
-    
-    except requests.exceptions.RequestException as e:
-        error_msg = f"Error making request: {str(e)}"
-        print(error_msg)
+        articles = search(query, NEWS_PROVIDERS, FETCH_RESULTS, mode=NEWS_SEARCH_MODE)
+    except ProviderError as e:
+        error_msg = str(e)
+        logger.warning(error_msg)
         return error_msg
-    except json.JSONDecodeError:
-        error_msg = "Error: Invalid JSON response from news API"
-        print(error_msg)
+
+    logger.debug("Found %d articles", len(articles))
+    if not articles:
+        return "No news articles found for the given query."
+
+    # Score by relevance, recency and source diversity, then keep the best few
+    ranked = rank_results(query, articles, MAX_RESULTS)
+
+    # Optionally pull main-text excerpts (quotes, figures) from the top articles
+    excerpts = fetch_excerpts(ranked, query) if FETCH_CONTENT else {}
+
+    result = _format_articles(ranked, excerpts)
+    logger.debug("Returning %d characters of results", len(result))
+    get_cache().set("tool:search_news", cache_key, result, TTL_TOOL)
+    return result
+
+
+async def _asearch_news(query: str) -> str:
+    """Asyncio version of _search_news, used when the tool is awaited."""
+    logger.info("search_news (async) called with query %r (mode: %s)", query, NEWS_SEARCH_MODE)
+    cache_key = _cache_key(query)
+    cached = await asyncio.to_thread(get_cache().get, "tool:search_news", cache_key)
+    if cached is not None:
+        logger.debug("Returning cached news results")
+        return cached
+
+    try:
+        articles = await asearch(query, NEWS_PROVIDERS, FETCH_RESULTS, mode=NEWS_SEARCH_MODE)
+    except ProviderError as e:
+        error_msg = str(e)
+        logger.warning(error_msg)
         return error_msg
 
+    logger.debug("Found %d articles", len(articles))
+    if not articles:
+        return "No news articles found for the given query."
+
+    ranked = rank_results(query, articles, MAX_RESULTS)
+    excerpts = await afetch_excerpts(ranked, query) if FETCH_CONTENT else {}
+
+    result = _format_articles(ranked, excerpts)
+    logger.debug("Returning %d characters of results", len(result))
+    await asyncio.to_thread(get_cache().set, "tool:search_news", cache_key, result, TTL_TOOL)
+    return result
+
 # Expose a Tool instance compatible with CrewAI
 search_news_tool = Tool(
     name="search_news",
     func=_search_news,
+    coroutine=_asearch_news,
     description="Search for recent news articles from the last 7 days on a given topic",
     args_schema=NewsSearchInput,
-    verbose=True,
+    verbose=verbose_for("tools"),
 )